@@ -0,0 +1,209 @@
+"""Event-driven backtester for the confluence bias signal and trading plan"""
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+import betterpredictormodule
+
+
+class ConfluenceBacktester:
+    """Replays candles bar by bar through the confluence pipeline and trades generate_trading_plan.
+
+    Every indicator and confluence score is causal, so they are computed once up front with
+    add_comprehensive_indicators + compute_confluence_scores; the event loop then walks the bars
+    in order and only ever looks at the current bar when filling orders and exits.
+
+    Plan rules (same as generate_trading_plan):
+      - Bullish/Bearish Bias above `min_strength` places a limit order at EMA 21
+      - Stop is ATR x `atr_stop_mult` beyond the entry
+      - Target is Pivot R1/S1 (target="pivot") or the Bollinger band (target="bb")
+    """
+
+    def __init__(self, analyzer=None, min_strength: float = 60, atr_stop_mult: float = 1.5,
+                 target: str = "pivot", entry_timeout: int = 20, max_hold: int = 500,
+                 fee_rate: float = 0.001, risk_per_trade: float = 0.01):
+        self.analyzer = analyzer or betterpredictormodule.TradingAnalyzer()
+        self.min_strength = min_strength
+        self.atr_stop_mult = atr_stop_mult
+        self.target = target
+        self.entry_timeout = entry_timeout  # Bars a pending entry order stays live
+        self.max_hold = max_hold  # Bars before an open trade is closed at market
+        self.fee_rate = fee_rate  # Per side
+        self.risk_per_trade = risk_per_trade  # Fraction of equity risked per trade (1-2% rule)
+
+    def run_stored(self, symbol: str = "BTCUSDT", interval: str = "1m", limit: Optional[int] = None) -> Dict:
+        """Backtest on candles already in the analyzer's candle store"""
+        if self.analyzer.candle_store is None:
+            raise Exception("Candle store not available")
+        df = self.analyzer.candle_store.load(symbol, interval, limit)
+        if df.empty:
+            raise Exception(f"No stored candles for {symbol} ({interval}). Run backfill_candle_store first.")
+        return self.run(df)
+
+    def run(self, df: pd.DataFrame) -> Dict:
+        """Backtest on an OHLCV frame and return the performance report"""
+        start = time.perf_counter()
+
+        df = self.analyzer.add_comprehensive_indicators(df.copy())
+        scores = self.analyzer.compute_confluence_scores(df)
+
+        strong = scores['Bias_Strength'].to_numpy() > self.min_strength
+        signal = np.where(strong & (scores['Bias'] == "Bullish Bias").to_numpy(), 1,
+                          np.where(strong & (scores['Bias'] == "Bearish Bias").to_numpy(), -1, 0))
+
+        if self.target == "bb":
+            long_target, short_target = df['BB_Upper'].to_numpy(), df['BB_Lower'].to_numpy()
+        else:
+            long_target, short_target = df['R1'].to_numpy(), df['S1'].to_numpy()
+
+        trades = self._simulate(
+            signal,
+            df['Open'].to_numpy(), df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(),
+            df['EMA_21'].to_numpy(), df['ATR'].to_numpy(), long_target, short_target
+        )
+
+        trades_df = pd.DataFrame(trades, columns=[
+            "Side", "Signal_Bar", "Entry_Bar", "Exit_Bar", "Entry", "Exit", "Stop", "Target",
+            "Exit_Reason", "R", "Return_Pct"
+        ])
+        if not trades_df.empty:
+            trades_df["Entry_Time"] = df.index[trades_df["Entry_Bar"].to_numpy()]
+            trades_df["Exit_Time"] = df.index[trades_df["Exit_Bar"].to_numpy()]
+
+        runtime = time.perf_counter() - start
+        report = self._summarize(trades_df, len(df), runtime)
+        report["Trades_Table"] = trades_df
+        return report
+
+    def _simulate(self, signal, open_, high, low, close, ema_21, atr, long_target, short_target):
+        """Bar-by-bar order/position state machine"""
+        trades = []
+        order = None
+        position = None
+
+        for i in range(len(close)):
+            if position is not None:
+                side, signal_bar, entry_bar, entry, stop, target = position
+                exit_price = None
+
+                # Stop is checked before target, so a bar touching both counts as a loss
+                if side == 1:
+                    if low[i] <= stop:
+                        exit_price, reason = min(open_[i], stop), "Stop"
+                    elif high[i] >= target:
+                        exit_price, reason = max(open_[i], target), "Target"
+                else:
+                    if high[i] >= stop:
+                        exit_price, reason = max(open_[i], stop), "Stop"
+                    elif low[i] <= target:
+                        exit_price, reason = min(open_[i], target), "Target"
+
+                if exit_price is None and i - entry_bar >= self.max_hold:
+                    exit_price, reason = close[i], "Timeout"
+
+                if exit_price is not None:
+                    trades.append(self._close_trade(position, i, exit_price, reason))
+                    position = None
+                continue
+
+            if order is not None:
+                side, signal_bar, entry, stop, target, expires = order
+                if i > expires:
+                    order = None
+                elif (side == 1 and low[i] <= entry) or (side == -1 and high[i] >= entry):
+                    # Limit fill, or better if the bar gapped through the entry
+                    fill = min(open_[i], entry) if side == 1 else max(open_[i], entry)
+                    position = (side, signal_bar, i, fill, stop, target)
+                    order = None
+
+                    # Fill bar can also take out the stop
+                    if (side == 1 and low[i] <= stop) or (side == -1 and high[i] >= stop):
+                        exit_price = min(fill, stop) if side == 1 else max(fill, stop)
+                        trades.append(self._close_trade(position, i, exit_price, "Stop"))
+                        position = None
+                    continue
+
+            if order is None and signal[i] != 0:
+                order = self._build_order(i, signal[i], ema_21, atr, long_target, short_target)
+
+        return trades
+
+    def _build_order(self, i, side, ema_21, atr, long_target, short_target):
+        """Turn a bias signal on bar i into an EMA 21 limit order, or None when the plan is invalid"""
+        entry = ema_21[i]
+        stop_distance = atr[i] * self.atr_stop_mult
+        if side == 1:
+            stop, target = entry - stop_distance, long_target[i]
+            valid = target > entry
+        else:
+            stop, target = entry + stop_distance, short_target[i]
+            valid = target < entry
+        if not valid or not stop_distance > 0:
+            return None
+        return (side, i, entry, stop, target, i + self.entry_timeout)
+
+    def _close_trade(self, position, exit_bar, exit_price, reason):
+        """Build the trade record for a closed position"""
+        side, signal_bar, entry_bar, entry, stop, target = position
+        risk = abs(entry - stop)
+        fees = self.fee_rate * (entry + exit_price)
+        r_multiple = (side * (exit_price - entry) - fees) / risk
+        return_pct = (side * (exit_price - entry) - fees) / entry * 100
+        return (
+            "Long" if side == 1 else "Short", signal_bar, entry_bar, exit_bar,
+            entry, exit_price, stop, target, reason, r_multiple, return_pct
+        )
+
+    def _summarize(self, trades_df: pd.DataFrame, bars: int, runtime: float) -> Dict:
+        """Hit rate, expectancy, drawdown and runtime for a finished backtest"""
+        report = {
+            "Bars": bars,
+            "Trades": len(trades_df),
+            "Runtime_Seconds": runtime,
+            "Seconds_Per_100k_Bars": runtime / bars * 100_000 if bars else 0.0
+        }
+        if trades_df.empty:
+            report.update({
+                "Hit_Rate": 0.0, "Avg_Win_R": 0.0, "Avg_Loss_R": 0.0, "Expectancy_R": 0.0,
+                "Expectancy_Pct": 0.0, "Total_Return_Pct": 0.0, "Max_Drawdown_Pct": 0.0
+            })
+            return report
+
+        r = trades_df["R"].to_numpy()
+        wins, losses = r[r > 0], r[r <= 0]
+
+        # Fixed-fractional equity: each trade risks risk_per_trade of current equity
+        equity = np.cumprod(1 + self.risk_per_trade * r)
+        peaks = np.maximum.accumulate(np.concatenate(([1.0], equity)))[1:]
+        drawdown = (peaks - equity) / peaks
+
+        report.update({
+            "Hit_Rate": len(wins) / len(r) * 100,
+            "Avg_Win_R": wins.mean() if len(wins) else 0.0,
+            "Avg_Loss_R": losses.mean() if len(losses) else 0.0,
+            "Expectancy_R": r.mean(),
+            "Expectancy_Pct": trades_df["Return_Pct"].mean(),
+            "Total_Return_Pct": (equity[-1] - 1) * 100,
+            "Max_Drawdown_Pct": drawdown.max() * 100
+        })
+        return report
+
+
+def format_backtest_report(report: Dict) -> str:
+    """Readable one-screen summary of a backtest report"""
+    lines = [
+        f"📊 Bars: {report['Bars']:,}  |  Trades: {report['Trades']}",
+        f"🎯 Hit Rate: {report['Hit_Rate']:.1f}%",
+        f"💰 Expectancy: {report['Expectancy_R']:+.2f}R ({report['Expectancy_Pct']:+.3f}% per trade after fees)",
+        f"📈 Avg Win: {report['Avg_Win_R']:+.2f}R  |  Avg Loss: {report['Avg_Loss_R']:+.2f}R",
+        f"📉 Max Drawdown: {report['Max_Drawdown_Pct']:.2f}%  |  Total Return: {report['Total_Return_Pct']:+.2f}%",
+        f"⏱️ Runtime: {report['Runtime_Seconds']:.2f}s ({report['Seconds_Per_100k_Bars']:.2f}s per 100k bars)"
+    ]
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    backtester = ConfluenceBacktester()
+    print(format_backtest_report(backtester.run_stored("BTCUSDT", "1m")))
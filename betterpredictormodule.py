@@ -1,4 +1,5 @@
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import numpy as np
 from ta.momentum import RSIIndicator, StochasticOscillator, WilliamsRIndicator
@@ -6,15 +7,82 @@ from ta.trend import EMAIndicator, SMAIndicator, MACD, ADXIndicator, IchimokuInd
 from ta.volatility import BollingerBands, AverageTrueRange, KeltnerChannel
 from ta.volume import OnBalanceVolumeIndicator, ChaikinMoneyFlowIndicator
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+import asyncio
 import warnings
 import time
 import random
+import copy
+import threading
+from candle_store_module import CandleStore
+from synthetic_market_module import generate_synthetic_ohlcv, interval_volatility
+from resample_module import downsample_ohlcv, upsample_ohlcv
+from symbol_registry_module import get_symbol_registry
+from rate_limit_module import get_rate_limiter, binance_klines_weight
+from singleflight_module import get_single_flight
 warnings.filterwarnings('ignore')
 
+# Candle length in minutes for every supported Binance interval
+INTERVAL_MINUTES = {
+    "1m": 1, "3m": 3, "5m": 5, "15m": 15, "30m": 30,
+    "1h": 60, "2h": 120, "4h": 240, "6h": 360, "12h": 720, "1d": 1440
+}
+
+# Score contributed by a confluence of each strength
+STRENGTH_WEIGHTS = {'Strong': 3, 'Medium': 2, 'Low': 1}
+
+# Tokens offered by the CLI token picker (and the default batch scan universe)
+TOKEN_OPTIONS = [
+    "BTCUSDT", "ETHUSDT", "BNBUSDT", "ADAUSDT", "SOLUSDT", 
+    "XRPUSDT", "DOGEUSDT", "AVAXUSDT", "MATICUSDT", "DOTUSDT",
+    "LINKUSDT", "UNIUSDT", "LTCUSDT", "BCHUSDT", "FILUSDT"
+]
+
+class MirrorRaceError(Exception):
+    """Every Binance mirror failed a hedged race"""
+
 class TradingAnalyzer:
-    def __init__(self):
+    def __init__(self, candle_store=None):
         self.confluence_threshold = 3  # Minimum confluences for strong signals
         
+        # Local candle cache so repeat analyses only top up the newest candles
+        try:
+            self.candle_store = candle_store if candle_store is not None else CandleStore()
+        except Exception as e:
+            print(f"Candle store unavailable: {str(e)}")
+            self.candle_store = None
+        
+        # Binance mirrors raced against each other by the hedged fetcher
+        self.binance_mirrors = [
+            "https://api.binance.com/api/v3/klines",
+            "https://api1.binance.com/api/v3/klines",
+            "https://api2.binance.com/api/v3/klines",
+            "https://api.binance.us/api/v3/klines",
+        ]
+        # Only binance.com candles are stored: Binance.US is a separate venue with its own prices
+        # and far lower volume, and mixing the two would corrupt every volume indicator
+        self.store_mirrors = [url for url in self.binance_mirrors if ".binance.com/" in url]
+        self.hedge_delay = 0.25  # Seconds to wait before launching the next mirror
+        
+        # One pooled HTTP session shared by every request this analyzer makes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Process-wide governor so concurrent sessions stay under Binance's weight limit
+        self.rate_limiter = get_rate_limiter()
+        
+        # Latest indicator frame per symbol/interval/limit, reused while its candles are unchanged
+        self._indicator_cache = {}
+        self._indicator_lock = threading.Lock()
+        self.indicator_cache_size = 64
+        
+        # Dedicated pool for blocking requests so losing mirrors never hold up asyncio.run()
+        # (sized for several sessions racing at once, since one analyzer serves the whole process)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.binance_mirrors) * 4)
+        
         # Enhanced proxy and fallback system
         self.proxy_endpoints = [
             # Primary fallback APIs (free alternatives)
@@ -56,15 +124,17 @@ class TradingAnalyzer:
             }
         ]
     
-    def make_request_with_fallback(self, url, max_retries=3):
+    def make_request_with_fallback(self, url, max_retries=3, weight=1):
         """Enhanced request method with proxy fallback and error handling"""
         
-        # Try direct connection first
+        # Try direct connection first (a 429 pauses the host, so the retry waits it out)
         for attempt in range(max_retries):
             try:
                 headers = random.choice(self.headers_list)
-                response = requests.get(
-                    url, 
+                response = self.rate_limiter.request(
+                    self.session, "GET", url,
+                    weight=weight,
+                    wait_timeout=30,
                     headers=headers, 
                     timeout=15,
                     verify=True  # Keep SSL verification for security
@@ -93,10 +163,10 @@ class TradingAnalyzer:
         if hasattr(self, 'proxy_api_key') and self.proxy_api_key:
             for proxy in self.proxy_list:
                 try:
-                    headers = random.choice(self.headers_list)
+                    headers = dict(random.choice(self.headers_list))  # Shared templates stay untouched
                     headers['X-API-Key'] = self.proxy_api_key
                     
-                    response = requests.get(
+                    response = self.session.get(
                         url,
                         headers=headers,
                         proxies=proxy,
@@ -117,7 +187,7 @@ class TradingAnalyzer:
         # Method 1: Try Binance main API
         binance_url = f"https://api.binance.com/api/v3/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}"
         try:
-            response = self.make_request_with_fallback(binance_url)
+            response = self.make_request_with_fallback(binance_url, weight=binance_klines_weight(limit))
             return self._parse_binance_response(response.json())
         except Exception as e:
             print(f"Binance main API failed: {str(e)}")
@@ -125,7 +195,7 @@ class TradingAnalyzer:
         # Method 2: Try Binance US API
         try:
             binance_us_url = f"https://api.binance.us/api/v3/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}"
-            response = self.make_request_with_fallback(binance_us_url)
+            response = self.make_request_with_fallback(binance_us_url, weight=binance_klines_weight(limit))
             return self._parse_binance_response(response.json())
         except Exception as e:
             print(f"Binance US API failed: {str(e)}")
@@ -161,24 +231,7 @@ class TradingAnalyzer:
     
     def _symbol_to_coingecko_id(self, symbol):
         """Convert trading symbol to CoinGecko ID"""
-        symbol_map = {
-            "BTCUSDT": "bitcoin",
-            "ETHUSDT": "ethereum", 
-            "BNBUSDT": "binancecoin",
-            "ADAUSDT": "cardano",
-            "SOLUSDT": "solana",
-            "XRPUSDT": "ripple",
-            "DOGEUSDT": "dogecoin",
-            "AVAXUSDT": "avalanche-2",
-            "MATICUSDT": "matic-network",
-            "DOTUSDT": "polkadot",
-            "LINKUSDT": "chainlink",
-            "UNIUSDT": "uniswap",
-            "LTCUSDT": "litecoin",
-            "BCHUSDT": "bitcoin-cash",
-            "FILUSDT": "filecoin"
-        }
-        return symbol_map.get(symbol.upper())
+        return get_symbol_registry().coingecko_id(symbol)
     
     def _fetch_coingecko_data(self, coin_id, interval, limit):
         """Fetch data from CoinGecko API"""
@@ -209,42 +262,28 @@ class TradingAnalyzer:
         if len(df) >= target_length:
             return df
         
-        # Simple interpolation method for demo
-        expanded_data = []
-        for i in range(len(df) - 1):
-            current = df.iloc[i]
-            next_row = df.iloc[i + 1]
-            
-            # Add current row
-            expanded_data.append(current)
-            
-            # Add interpolated rows
-            steps = min(4, target_length // len(df))  # Create up to 4 sub-intervals
-            for step in range(1, steps):
-                ratio = step / steps
-                interpolated = {
-                    'Open': current['Close'],  # Open is previous close
-                    'High': current['High'] + ratio * (next_row['High'] - current['High']),
-                    'Low': current['Low'] + ratio * (next_row['Low'] - current['Low']),
-                    'Close': current['Close'] + ratio * (next_row['Close'] - current['Close']),
-                    'Volume': current['Volume'] * (1 + random.uniform(-0.3, 0.3))
-                }
-                
-                # Create timestamp
-                time_diff = next_row.name - current.name
-                new_time = current.name + (time_diff * ratio)
-                
-                new_row = pd.Series(interpolated, name=new_time)
-                expanded_data.append(new_row)
-        
-        # Add final row
-        if len(df) > 0:
-            expanded_data.append(df.iloc[-1])
-        
-        result_df = pd.DataFrame(expanded_data)
+        # Interpolate up to 4 sub-intervals per candle
+        steps = min(4, target_length // len(df))
+        result_df = upsample_ohlcv(df, steps)
         return result_df.tail(target_length)
     
-    def _generate_synthetic_data(self, symbol, interval, limit):
+    def load_stored_timeframe(self, symbol, interval, limit, base_interval="1m"):
+        """Serve any timeframe from candles stored at a finer base resolution, without a network fetch"""
+        if self.candle_store is None:
+            raise Exception("Candle store not available")
+        
+        base_minutes = INTERVAL_MINUTES[base_interval]
+        factor, remainder = divmod(INTERVAL_MINUTES[interval], base_minutes)
+        if remainder or factor < 1:
+            raise Exception(f"{interval} is not a multiple of {base_interval}")
+        
+        # One extra bucket covers a partial leading candle
+        base_df = self.candle_store.load(symbol, base_interval, (limit + 1) * factor)
+        if factor == 1:
+            return base_df.tail(limit)
+        return downsample_ohlcv(base_df, INTERVAL_MINUTES[interval]).tail(limit)
+    
+    def _generate_synthetic_data(self, symbol, interval, limit, seed=None):
         """Generate realistic synthetic OHLCV data for demo purposes"""
         print(f"Generating synthetic data for {symbol} ({interval}) - {limit} candles")
         
@@ -264,73 +303,67 @@ class TradingAnalyzer:
         
         base_price = base_prices.get(symbol.upper(), 1.0)
         
-        # Generate time series
-        interval_minutes = {
-            "1m": 1, "3m": 3, "5m": 5, "15m": 15, "30m": 30,
-            "1h": 60, "2h": 120, "4h": 240, "6h": 360, "12h": 720, "1d": 1440
-        }
-        
-        minutes = interval_minutes.get(interval, 15)
-        end_time = datetime.now()
-        timestamps = pd.date_range(
-            end=end_time, 
-            periods=limit, 
-            freq=f"{minutes}min"
+        # Vectorized GBM with regime switching and volatility clustering on a local RNG
+        minutes = INTERVAL_MINUTES.get(interval, 15)
+        df = generate_synthetic_ohlcv(
+            limit,
+            base_price=base_price,
+            minutes=minutes,
+            volatility=interval_volatility(minutes),
+            seed=seed
         )
         
-        # Generate realistic price movement
-        np.random.seed(42)  # For reproducible results
-        returns = np.random.normal(0, 0.01, limit)  # 1% volatility
-        
-        # Add some trending behavior
-        trend = np.linspace(-0.02, 0.02, limit)  # Slight upward trend
-        returns += trend
-        
-        # Generate price series
-        prices = [base_price]
-        for i in range(1, limit):
-            new_price = prices[-1] * (1 + returns[i])
-            prices.append(max(new_price, base_price * 0.1))  # Prevent negative prices
-        
-        # Generate OHLCV data
-        data = []
-        for i, (timestamp, price) in enumerate(zip(timestamps, prices)):
-            # Generate realistic OHLC from close price
-            volatility = random.uniform(0.005, 0.025)  # 0.5% to 2.5% intrabar movement
-            
-            open_price = prices[i-1] if i > 0 else price
-            close_price = price
-            
-            high_price = max(open_price, close_price) * (1 + random.uniform(0, volatility))
-            low_price = min(open_price, close_price) * (1 - random.uniform(0, volatility))
-            
-            volume = random.uniform(50000, 500000)  # Random volume
-            
-            data.append({
-                "Open Time": timestamp,
-                "Open": open_price,
-                "High": high_price, 
-                "Low": low_price,
-                "Close": close_price,
-                "Volume": volume
-            })
-        
-        df = pd.DataFrame(data)
-        df.set_index('Open Time', inplace=True)
-        
         print(f"Generated {len(df)} synthetic candles for {symbol}")
         return df
     
     def fetch_binance_ohlcv(self, symbol="BTCUSDT", interval="15m", limit=1000):
         """Enhanced fetch method with comprehensive fallback system"""
+        # Identical fetches in flight from any session share one upstream request
+        df = get_single_flight().do(
+            ("ohlcv", symbol.upper(), interval, limit), self._fetch_binance_ohlcv, symbol, interval, limit
+        )
+        return df.copy()
+    
+    def fetch_exchange_ohlcv(self, symbol="BTCUSDT", interval="15m", limit=500):
+        """Real binance.com klines only - raises instead of falling back to other venues,
+        interpolated CoinGecko candles or synthetic data (for joining onto live stream data)"""
+        def fetch():
+            if self.candle_store is not None:
+                return self._fetch_with_candle_store(symbol, interval, limit)
+            return self._try_hedged_binance(symbol, interval, limit, mirrors=self.store_mirrors)
+        
+        df = get_single_flight().do(("exchange_ohlcv", symbol.upper(), interval, limit), fetch)
+        return df.copy()
+    
+    def _fetch_binance_ohlcv(self, symbol, interval, limit):
+        """Candle store first, then hedged mirrors, alternative APIs and synthetic data"""
+        
+        # Serve repeat requests from the candle store, topping up only new candles
+        mirrors_failed = False
+        if self.candle_store is not None:
+            try:
+                df = self._fetch_with_candle_store(symbol, interval, limit)
+                if df is not None and len(df) > 50:
+                    print("✅ Success with Candle Store")
+                    return df
+            except MirrorRaceError as e:
+                mirrors_failed = True
+                print(f"❌ Candle Store failed: {str(e)}")
+            except Exception as e:
+                print(f"❌ Candle Store failed: {str(e)}")
         
         # Try multiple approaches in order of preference
         methods = [
-            ("Direct Binance API", self._try_direct_binance),
-            ("Binance with Rotation", self._try_binance_with_rotation),
+            ("Hedged Binance Mirrors", self._try_hedged_binance),
             ("Alternative APIs", self._try_alternative_apis),
             ("Synthetic Data", self._generate_synthetic_fallback)
         ]
+        if mirrors_failed:
+            # The binance.com mirrors were just raced for the store - only race the others now
+            others = [url for url in self.binance_mirrors if url not in self.store_mirrors]
+            methods = methods[1:]
+            if others:
+                methods.insert(0, ("Other Binance Mirrors", partial(self._try_hedged_binance, mirrors=others)))
         
         for method_name, method_func in methods:
             try:
@@ -348,32 +381,157 @@ class TradingAnalyzer:
         # If all methods fail, raise an exception
         raise Exception("All data fetching methods failed. Please check your internet connection.")
     
-    def _try_direct_binance(self, symbol, interval, limit):
-        """Try direct Binance API call"""
-        url = f"https://api.binance.com/api/v3/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}"
-        response = self.make_request_with_fallback(url)
-        return self._parse_binance_response(response.json())
+    def _fetch_with_candle_store(self, symbol, interval, limit):
+        """Fetch only candles newer than the last stored Open Time and append them"""
+        symbol = symbol.upper()
+        count, last_open = self.candle_store.span(symbol, interval)
+        
+        step_ms = INTERVAL_MINUTES.get(interval, 15) * 60 * 1000
+        now_ms = int(time.time() * 1000)
+        
+        new_candles = None if last_open is None else (now_ms - last_open) // step_ms
+        if new_candles is not None and count >= limit and new_candles < limit:
+            # The top-up only bridges the gap after last_open, so the stored part of the
+            # window must be contiguous - a hole from an older fetch forces a full fetch
+            window_start = last_open - (limit - new_candles - 1) * step_ms
+            stored, _ = self.candle_store.span(symbol, interval, since=window_start)
+            contiguous = stored >= limit - new_candles
+        else:
+            contiguous = False
+        
+        if not contiguous:
+            # Too little stored, too stale to bridge, or gapped - full fetch reseeds the window
+            data = asyncio.run(self._race_binance_mirrors(symbol, interval, limit, mirrors=self.store_mirrors))
+        else:
+            # Start at the last stored candle, which may still have been forming
+            missing = new_candles + 1
+            data = asyncio.run(self._race_binance_mirrors(
+                symbol, interval, min(1000, missing), start_time=last_open, mirrors=self.store_mirrors
+            ))
+        
+        self.candle_store.save(symbol, interval, self._parse_binance_response(data))
+        return self.candle_store.load(symbol, interval, limit)
     
-    def _try_binance_with_rotation(self, symbol, interval, limit):
-        """Try Binance with header rotation and delays"""
-        urls = [
-            f"https://api.binance.com/api/v3/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}",
-            f"https://api.binance.us/api/v3/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}",
-            f"https://api1.binance.com/api/v3/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}",
-            f"https://api2.binance.com/api/v3/klines?symbol={symbol.upper()}&interval={interval}&limit={limit}"
-        ]
+    def backfill_candle_store(self, symbol="BTCUSDT", interval="1m", days=365):
+        """Page historical klines into the candle store (1000 per request) for backtesting"""
+        if self.candle_store is None:
+            raise Exception("Candle store not available")
+        
+        symbol = symbol.upper()
+        step_ms = INTERVAL_MINUTES.get(interval, 15) * 60 * 1000
+        now_ms = int(time.time() * 1000)
+        start_time = now_ms - days * 24 * 60 * 60 * 1000
+        
+        total = 0
+        while start_time < now_ms:
+            data = asyncio.run(self._race_binance_mirrors(
+                symbol, interval, 1000, start_time=start_time, mirrors=self.store_mirrors
+            ))
+            if not data:
+                break
+            total += self.candle_store.save(symbol, interval, self._parse_binance_response(data))
+            start_time = int(data[-1][0]) + step_ms
+            print(f"Backfilled {total} {symbol} ({interval}) candles...")
         
-        for url in urls:
-            try:
-                headers = random.choice(self.headers_list)
-                response = requests.get(url, headers=headers, timeout=12)
-                if response.status_code == 200:
-                    return self._parse_binance_response(response.json())
-                time.sleep(random.uniform(0.5, 1.5))  # Rate limiting
-            except Exception:
-                continue
+        return total
+    
+    def fetch_binance_history(self, symbol="BTCUSDT", interval="15m", total=1000):
+        """Fetch more than 1000 candles with every page requested concurrently (one round trip of latency)"""
+        if total <= 1000:
+            return self.fetch_binance_ohlcv(symbol=symbol, interval=interval, limit=total)
         
-        return None
+        symbol = symbol.upper()
+        step_ms = INTERVAL_MINUTES.get(interval, 15) * 60 * 1000
+        first_open = (int(time.time() * 1000) // step_ms - total + 1) * step_ms
+        starts = range(first_open, first_open + total * step_ms, 1000 * step_ms)
+        
+        try:
+            pages = asyncio.run(self._race_binance_pages(symbol, interval, starts))
+            df = pd.concat([self._parse_binance_response(page) for page in pages])
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+            if self.candle_store is not None:
+                self.candle_store.save(symbol, interval, df)
+            print(f"✅ Fetched {len(df)} {symbol} ({interval}) candles in {len(pages)} concurrent pages")
+            return df.tail(total)
+        except Exception as e:
+            print(f"❌ Paged Binance fetch failed: {str(e)}")
+            return self._generate_synthetic_data(symbol, interval, total)
+    
+    async def _race_binance_pages(self, symbol, interval, starts):
+        """Hedged race for every 1000-candle page at once"""
+        return await asyncio.gather(*(
+            self._race_binance_mirrors(symbol, interval, 1000, start_time=start, mirrors=self.store_mirrors)
+            for start in starts
+        ))
+    
+    def _try_hedged_binance(self, symbol, interval, limit, mirrors=None):
+        """Race the Binance mirrors (all by default) and parse the first good response"""
+        data = asyncio.run(self._race_binance_mirrors(symbol, interval, limit, mirrors=mirrors))
+        return self._parse_binance_response(data)
+    
+    def _get_klines(self, url, params, decided=None):
+        """Blocking klines request on the shared session, abandoned as soon as `decided` is set"""
+        headers = random.choice(self.headers_list)
+        # Short queue timeout: a paused host should lose the race, not hold an executor thread
+        self.rate_limiter.acquire(url, weight=binance_klines_weight(params.get("limit", 500)), timeout=10)
+        if decided is not None and decided.is_set():
+            raise Exception(f"{url} skipped - race already decided")
+        
+        # Streamed so a loser can drop its connection without downloading the candles
+        response = self.session.get(url, params=params, headers=headers, timeout=12, stream=True)
+        with response:
+            self.rate_limiter.observe(url, response)
+            if response.status_code != 200:
+                raise Exception(f"{url} returned status {response.status_code}")
+            if decided is not None and decided.is_set():
+                raise Exception(f"{url} abandoned - race already decided")
+            return response.json()
+    
+    async def _fetch_mirror(self, url, params, delay, decided):
+        """Fetch klines from one mirror once its hedge delay has passed"""
+        if delay:
+            await asyncio.sleep(delay)
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(self._executor, partial(self._get_klines, url, params, decided))
+        return url, data
+    
+    async def _race_binance_mirrors(self, symbol, interval, limit, start_time=None, mirrors=None):
+        """Hedged race across the Binance mirrors - first good payload wins.
+        
+        Losers still waiting on their hedge delay never send. A request already handed to the
+        executor can't be interrupted, so it checks `decided` before sending and again once
+        headers arrive, closing the connection instead of reading the body.
+        """
+        params = {"symbol": symbol.upper(), "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = int(start_time)
+        
+        # Mirror i only starts after i * hedge_delay, so a healthy primary answers alone
+        decided = threading.Event()
+        pending = {
+            asyncio.create_task(self._fetch_mirror(url, params, i * self.hedge_delay, decided))
+            for i, url in enumerate(mirrors or self.binance_mirrors)
+        }
+        errors = []
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(str(task.exception()))
+                        continue
+                    url, data = task.result()
+                    if data:
+                        print(f"Fastest mirror: {url}")
+                        return data
+                    errors.append(f"{url} returned no candles")
+        finally:
+            decided.set()
+            for task in pending:
+                task.cancel()
+        
+        raise MirrorRaceError("All Binance mirrors failed: " + "; ".join(errors))
     
     def _try_alternative_apis(self, symbol, interval, limit):
         """Try alternative crypto APIs"""
@@ -771,7 +929,10 @@ class TradingAnalyzer:
     def generate_comprehensive_analysis(self, df):
         """Generate comprehensive market analysis (unchanged from original)"""
         latest_row = df.iloc[-1]
-        
+        return self.analyze_latest_row(latest_row), latest_row
+    
+    def analyze_latest_row(self, latest_row):
+        """Gather all confluences for a single indicator row (e.g. one from a live IndicatorState)"""
         # Gather all confluences
         momentum_conf = self.analyze_momentum_confluence(latest_row)
         trend_conf = self.analyze_trend_confluence(latest_row)
@@ -792,11 +953,11 @@ class TradingAnalyzer:
                        price_action_conf['neutral'])
         }
         
-        return all_confluences, latest_row
+        return all_confluences
     
     def calculate_confluence_strength(self, confluences):
         """Calculate overall confluence strength (unchanged from original)"""
-        strength_weights = {'Strong': 3, 'Medium': 2, 'Low': 1}
+        strength_weights = STRENGTH_WEIGHTS
         
         bullish_score = sum(strength_weights.get(conf['strength'], 1) for conf in confluences['bullish'])
         bearish_score = sum(strength_weights.get(conf['strength'], 1) for conf in confluences['bearish'])
@@ -816,6 +977,189 @@ class TradingAnalyzer:
         else:
             return "Mixed/Neutral", max(bullish_score, bearish_score) / total_score * 100
     
+    def analyze_symbol(self, symbol="BTCUSDT", interval="15m", limit=500):
+        """Fetch, add indicators and score confluences - returns (df, confluences, latest, bias, strength).
+        
+        Concurrent identical analyses share one computation; each caller gets its own copies.
+        """
+        def run():
+            df = self._indicators_for(symbol, interval, limit)
+            confluences, latest = self.generate_comprehensive_analysis(df)
+            bias, strength = self.calculate_confluence_strength(confluences)
+            return df, confluences, latest, bias, strength
+        
+        df, confluences, latest, bias, strength = get_single_flight().do(
+            ("analysis", symbol.upper(), interval, limit), run
+        )
+        return df.copy(), copy.deepcopy(confluences), latest.copy(), bias, strength
+    
+    def _indicators_for(self, symbol, interval, limit):
+        """Indicator frame for the latest candles, recomputed only when the candles changed"""
+        raw = self.fetch_binance_ohlcv(symbol=symbol, interval=interval, limit=limit)
+        key = (symbol.upper(), interval, limit)
+        fingerprint = (len(raw), raw.index[0], raw.index[-1], tuple(raw.iloc[-1]))
+        
+        with self._indicator_lock:
+            cached = self._indicator_cache.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        df = self.add_comprehensive_indicators(raw)
+        with self._indicator_lock:
+            self._indicator_cache.pop(key, None)
+            self._indicator_cache[key] = (fingerprint, df)
+            while len(self._indicator_cache) > self.indicator_cache_size:
+                self._indicator_cache.pop(next(iter(self._indicator_cache)))
+        return df
+    
+    def compute_confluence_scores(self, df):
+        """Vectorized confluence engine - bullish/bearish/neutral scores and bias for every bar.
+        
+        Mirrors the analyze_* rules and calculate_confluence_strength exactly, but evaluates
+        each condition as a boolean column over the whole indicator frame in one pass.
+        """
+        def col(name):
+            return df[name].to_numpy(dtype=float)
+        
+        strong, medium, low = STRENGTH_WEIGHTS['Strong'], STRENGTH_WEIGHTS['Medium'], STRENGTH_WEIGHTS['Low']
+        n = len(df)
+        scores = {side: np.zeros(n) for side in ('bullish', 'bearish', 'neutral')}
+        counts = {side: np.zeros(n, dtype=int) for side in ('bullish', 'bearish', 'neutral')}
+        
+        def add(side, mask, weight):
+            scores[side] += np.where(mask, weight, 0)
+            counts[side] += mask
+        
+        close, open_ = col('Close'), col('Open')
+        
+        # Momentum
+        rsi = col('RSI_14')
+        add('bullish', rsi < 30, medium)
+        add('bearish', rsi > 70, medium)
+        add('neutral', (rsi >= 45) & (rsi <= 55), low)
+        
+        stoch_k, stoch_d = col('Stoch_K'), col('Stoch_D')
+        stoch_oversold = (stoch_k < 20) & (stoch_d < 20)
+        add('bullish', stoch_oversold, np.where(stoch_k > stoch_d, strong, medium))
+        add('bearish', ~stoch_oversold & (stoch_k > 80) & (stoch_d > 80), np.where(stoch_k < stoch_d, strong, medium))
+        
+        williams = col('Williams_R')
+        add('bullish', williams < -80, medium)
+        add('bearish', williams > -20, medium)
+        
+        # Trend
+        ema_9, ema_21, ema_50 = col('EMA_9'), col('EMA_21'), col('EMA_50')
+        add('bullish', (ema_9 > ema_21) & (ema_21 > ema_50), strong)
+        add('bearish', (ema_9 < ema_21) & (ema_21 < ema_50), strong)
+        
+        above_ema_21 = close > ema_21
+        add('bullish', above_ema_21, medium)
+        add('bearish', ~above_ema_21, medium)
+        
+        macd, macd_signal, macd_hist = col('MACD'), col('MACD_Signal'), col('MACD_Histogram')
+        add('bullish', (macd > macd_signal) & (macd_hist > 0), strong)
+        add('bearish', (macd < macd_signal) & (macd_hist < 0), strong)
+        
+        adx, di_plus, di_minus = col('ADX'), col('DI_Plus'), col('DI_Minus')
+        trending = adx > 25
+        adx_weight = np.where(adx > 40, strong, medium)
+        add('bullish', trending & (di_plus > di_minus), adx_weight)
+        add('bearish', trending & ~(di_plus > di_minus), adx_weight)
+        add('neutral', adx < 20, medium)
+        
+        # Volatility
+        bb_pos = col('BB_Position')
+        add('bullish', bb_pos < 0.1, medium)
+        add('bearish', bb_pos > 0.9, medium)
+        
+        bb_width = col('BB_Width')
+        add('neutral', bb_width < 2, strong)
+        add('neutral', bb_width > 8, medium)
+        
+        add('neutral', col('ATR_Percent') > 3, medium)
+        
+        # Volume
+        volume_ratio = col('Volume_Ratio')
+        add('neutral', volume_ratio > 1.5, np.where(volume_ratio > 2, strong, medium))
+        add('neutral', volume_ratio < 0.7, medium)
+        
+        cmf = col('CMF')
+        add('bullish', cmf > 0.2, np.where(cmf > 0.3, strong, medium))
+        add('bearish', cmf < -0.2, np.where(cmf < -0.3, strong, medium))
+        
+        # Price action
+        body, upper_wick, lower_wick = col('Body_Size'), col('Upper_Wick'), col('Lower_Wick')
+        bullish_candle, bearish_candle = close > open_, close < open_
+        large_body = body > 2
+        body_weight = np.where(body > 3, strong, medium)
+        add('bullish', large_body & bullish_candle, body_weight)
+        add('bearish', large_body & ~bullish_candle, body_weight)
+        add('bearish', (upper_wick > body * 2) & bullish_candle, medium)
+        add('bullish', (lower_wick > body * 2) & bearish_candle, medium)
+        
+        # Overall bias, same rules as calculate_confluence_strength
+        bullish, bearish, neutral = scores['bullish'], scores['bearish'], scores['neutral']
+        total = bullish + bearish + neutral
+        safe_total = np.where(total == 0, 1, total)
+        is_bullish = (bullish > bearish) & (bullish >= self.confluence_threshold)
+        is_bearish = (bearish > bullish) & (bearish >= self.confluence_threshold)
+        
+        bias = np.select(
+            [total == 0, is_bullish, is_bearish],
+            ["No Clear Signal", "Bullish Bias", "Bearish Bias"],
+            default="Mixed/Neutral"
+        )
+        bias_strength = np.select(
+            [total == 0, is_bullish, is_bearish],
+            [0.0, bullish / safe_total * 100, bearish / safe_total * 100],
+            default=np.maximum(bullish, bearish) / safe_total * 100
+        )
+        
+        return pd.DataFrame({
+            'Bullish_Score': bullish,
+            'Bearish_Score': bearish,
+            'Neutral_Score': neutral,
+            'Bullish_Count': counts['bullish'],
+            'Bearish_Count': counts['bearish'],
+            'Neutral_Count': counts['neutral'],
+            'Bias': bias,
+            'Bias_Strength': bias_strength
+        }, index=df.index)
+    
+    def analyze_many(self, symbols, intervals, limit=500, max_workers=None):
+        """Analyze every symbol/interval pair and return a tidy bias/strength table"""
+        pairs = [(symbol.upper(), interval) for symbol in symbols for interval in intervals]
+        if not pairs:
+            return pd.DataFrame(columns=ANALYZE_MANY_COLUMNS)
+        
+        # Network-bound step: fetch every pair concurrently
+        with ThreadPoolExecutor(max_workers=min(16, len(pairs))) as pool:
+            futures = {
+                pair: pool.submit(self.fetch_binance_ohlcv, symbol=pair[0], interval=pair[1], limit=limit)
+                for pair in pairs
+            }
+        
+        frames = {}
+        results = {}
+        for pair, future in futures.items():
+            try:
+                frames[pair] = future.result()
+            except Exception as e:
+                results[pair] = {"Error": str(e)}
+        
+        # CPU-bound step: indicators and confluence scoring across a process pool
+        ready = list(frames)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                summaries = list(pool.map(_analyze_frame, [frames[pair] for pair in ready]))
+        except Exception as e:
+            print(f"Process pool unavailable ({str(e)}), analyzing in-process...")
+            summaries = [_analyze_frame(frames[pair], self) for pair in ready]
+        results.update(zip(ready, summaries))
+        
+        rows = [{"Symbol": symbol, "Interval": interval, **results[(symbol, interval)]} for symbol, interval in pairs]
+        return pd.DataFrame(rows, columns=ANALYZE_MANY_COLUMNS)
+    
     def display_analysis(self, symbol, timeframe, confluences, latest_row):
         """Display comprehensive analysis results (unchanged from original)"""
         print(f"\n{'='*80}")
@@ -880,13 +1224,53 @@ class TradingAnalyzer:
         print("⚡ Remember: This analysis is for educational purposes. Always use proper risk management!")
         print(f"{'='*80}")
 
+ANALYZE_MANY_COLUMNS = [
+    "Symbol", "Interval", "Bias", "Strength", "Price", "RSI_14",
+    "Bullish", "Bearish", "Neutral", "Error"
+]
+
+# Per-process analyzer reused by the analyze_many worker
+_worker_analyzer = None
+
+# Application-scoped analyzer shared by every caller in the server process
+_shared_analyzer = None
+_shared_analyzer_lock = threading.Lock()
+
+def get_trading_analyzer():
+    """Process-wide TradingAnalyzer - warm HTTP pool, candle store and indicator cache, built once"""
+    global _shared_analyzer
+    with _shared_analyzer_lock:
+        if _shared_analyzer is None:
+            _shared_analyzer = TradingAnalyzer()
+        return _shared_analyzer
+
+def _analyze_frame(df, analyzer=None):
+    """Indicators + confluence summary for one OHLCV frame (runs inside pool workers)"""
+    global _worker_analyzer
+    if analyzer is None:
+        if _worker_analyzer is None:
+            _worker_analyzer = TradingAnalyzer()
+        analyzer = _worker_analyzer
+    
+    try:
+        df = analyzer.add_comprehensive_indicators(df)
+        confluences, latest = analyzer.generate_comprehensive_analysis(df)
+        bias, strength = analyzer.calculate_confluence_strength(confluences)
+        return {
+            "Bias": bias,
+            "Strength": strength,
+            "Price": latest['Close'],
+            "RSI_14": latest['RSI_14'],
+            "Bullish": len(confluences['bullish']),
+            "Bearish": len(confluences['bearish']),
+            "Neutral": len(confluences['neutral'])
+        }
+    except Exception as e:
+        return {"Error": str(e)}
+
 def user_input_token():
     """Enhanced token selection with more options (unchanged from original)"""
-    options = [
-        "BTCUSDT", "ETHUSDT", "BNBUSDT", "ADAUSDT", "SOLUSDT", 
-        "XRPUSDT", "DOGEUSDT", "AVAXUSDT", "MATICUSDT", "DOTUSDT",
-        "LINKUSDT", "UNIUSDT", "LTCUSDT", "BCHUSDT", "FILUSDT"
-    ]
+    options = TOKEN_OPTIONS
     print("\n🪙 Select a token to analyze:")
     for i, token in enumerate(options[:10], start=1):
         print(f"{i:2d}. {token}")
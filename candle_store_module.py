@@ -0,0 +1,88 @@
+"""Persistent OHLCV candle store backed by SQLite"""
+import sqlite3
+import threading
+from typing import Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_CANDLE_DB = "candle_store.db"
+
+
+class CandleStore:
+    """Local candle cache keyed by symbol and interval.
+
+    Candles are stored by their Open Time in epoch milliseconds, so a later
+    fetch only needs the candles from the last stored Open Time onwards.
+    """
+
+    def __init__(self, path: str = DEFAULT_CANDLE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS candles (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    open_time INTEGER NOT NULL,
+                    open REAL, high REAL, low REAL, close REAL, volume REAL,
+                    PRIMARY KEY (symbol, interval, open_time)
+                ) WITHOUT ROWID
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the store safe across Streamlit threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def span(self, symbol: str, interval: str, since: Optional[int] = None) -> Tuple[int, Optional[int]]:
+        """Return (stored candle count, last Open Time in ms) for a symbol/interval,
+        counting only candles opened at or after `since` (ms) when given"""
+        query = "SELECT COUNT(*), MAX(open_time) FROM candles WHERE symbol = ? AND interval = ?"
+        params = [symbol.upper(), interval]
+        if since is not None:
+            query += " AND open_time >= ?"
+            params.append(int(since))
+
+        with self._connect() as conn:
+            count, last_open = conn.execute(query, params).fetchone()
+        return count, last_open
+
+    def save(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """Upsert candles from an OHLCV frame indexed by Open Time"""
+        if df is None or df.empty:
+            return 0
+
+        open_times = (df.index - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+        rows = [
+            (symbol.upper(), interval, int(ts), float(o), float(h), float(l), float(c), float(v))
+            for ts, o, h, l, c, v in zip(
+                open_times, df["Open"], df["High"], df["Low"], df["Close"], df["Volume"]
+            )
+        ]
+
+        # The newest stored candle may still have been forming, so replace on conflict
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def load(self, symbol: str, interval: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """Load the most recent `limit` candles (all when None) in chronological order"""
+        query = (
+            "SELECT open_time, open, high, low, close, volume FROM candles "
+            "WHERE symbol = ? AND interval = ? ORDER BY open_time DESC"
+        )
+        params = [symbol.upper(), interval]
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        df = pd.DataFrame(rows[::-1], columns=["Open Time", "Open", "High", "Low", "Close", "Volume"])
+        df["Open Time"] = pd.to_datetime(df["Open Time"], unit="ms")
+        df.set_index("Open Time", inplace=True)
+        return df
@@ -0,0 +1,188 @@
+"""Local CoinGecko coin index - trigram candidate generation plus fuzzy scoring on the shortlist"""
+import json
+import os
+import threading
+import time
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+import numpy as np
+import requests
+
+from rate_limit_module import BACKGROUND, INTERACTIVE, get_rate_limiter
+
+try:
+    from rapidfuzz import fuzz
+except Exception:
+    try:
+        from fuzzywuzzy import fuzz
+    except Exception:
+        fuzz = None
+
+COIN_LIST_URL = "https://api.coingecko.com/api/v3/coins/list"
+DEFAULT_COIN_INDEX_PATH = "coin_index.json"
+DEFAULT_MAX_AGE = 24 * 3600
+RETRY_AFTER_FAILURE = 300  # Seconds before a failed download is tried again
+FIRST_BUILD_WAIT = 20  # How long concurrent first callers wait for the in-flight download
+SHORTLIST_SIZE = 50
+
+
+def _score(query: str, term: str) -> float:
+    """0-100 similarity; rapidfuzz/fuzzywuzzy WRatio when installed, difflib otherwise"""
+    if fuzz is not None:
+        return fuzz.WRatio(query, term)
+    return SequenceMatcher(None, query, term).ratio() * 100
+
+
+def _trigrams(term: str) -> set:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CoinIndex:
+    """IDs, symbols and names of every CoinGecko coin, persisted to disk and refreshed in the background.
+
+    Lookups never touch the network once the index exists: an inverted trigram index picks a
+    shortlist of candidates and only those are fuzzy-scored.
+    """
+
+    def __init__(self, path: str = DEFAULT_COIN_INDEX_PATH, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.fetched_at = 0.0
+        self._retry_at = 0.0
+        self._lock = threading.Condition()
+        self._refreshing = False
+        self._build([])
+        self._load()
+
+    @property
+    def ready(self) -> bool:
+        return len(self._index[0]) > 0
+
+    def suggest(self, user_input: str, limit: int = 5, min_score: float = 60) -> List[str]:
+        """Coin IDs most similar to user_input (best first)"""
+        self.ensure_fresh()
+        query = user_input.lower().strip()
+        ids, terms, exact, postings = self._index
+        if not query or not ids:
+            return []
+
+        # Exact id/symbol/name hits first
+        exact_hits = list(exact.get(query, ()))
+
+        # Candidate generation: coins sharing the most trigrams with the query
+        lists = [postings[gram] for gram in _trigrams(query) if gram in postings]
+        if lists:
+            overlap = np.bincount(np.concatenate(lists), minlength=len(ids))
+            size = min(SHORTLIST_SIZE, int(np.count_nonzero(overlap)))
+            shortlist = np.argpartition(-overlap, size - 1)[:size] if size else []
+        else:
+            shortlist = []
+
+        scored = {}
+        for i in list(shortlist) + exact_hits:
+            scored[int(i)] = max(_score(query, term) for term in terms[i])
+        for i in exact_hits:
+            scored[i] = 101  # Exact matches always rank first
+
+        ranked = sorted(scored.items(), key=lambda item: -item[1])
+        return [ids[i] for i, score in ranked if score > min_score][:limit]
+
+    def lookup(self, term: str) -> List[str]:
+        """Coin IDs whose id, symbol or name equals term exactly"""
+        self.ensure_fresh()
+        ids, _, exact, _ = self._index
+        return [ids[i] for i in exact.get(term.lower().strip(), ())]
+
+    def ensure_fresh(self):
+        """Block for the first build; afterwards refresh in the background once the index is stale.
+
+        Only one download runs at a time - concurrent first callers wait for it - and after a
+        failure lookups use whatever index exists (possibly none) until RETRY_AFTER_FAILURE passes.
+        """
+        if time.time() < self._retry_at:
+            return
+        if not self.ready:
+            with self._lock:
+                if self._refreshing:
+                    self._lock.wait(FIRST_BUILD_WAIT)
+                    return
+                self._refreshing = True
+            self.refresh()
+        elif time.time() - self.fetched_at > self.max_age:
+            self.refresh_async()
+
+    def refresh_async(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, kwargs={"priority": BACKGROUND},
+                         name="coin-index-refresh", daemon=True).start()
+
+    def refresh(self, priority: int = INTERACTIVE):
+        """Download /coins/list, rebuild the index and persist it"""
+        try:
+            response = get_rate_limiter().request(requests, "GET", COIN_LIST_URL, priority=priority, timeout=15)
+            response.raise_for_status()
+            coins = response.json()
+            self._build(coins)
+            self.fetched_at = time.time()
+            self._save(coins)
+        except Exception as e:
+            self._retry_at = time.time() + RETRY_AFTER_FAILURE
+            print(f"Coin index refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._lock.notify_all()
+
+    def _build(self, coins: List[Dict]):
+        ids, terms, exact, grams = [], [], {}, {}
+        for coin in coins:
+            coin_terms = {
+                str(coin.get(field) or "").lower().strip()
+                for field in ("id", "symbol", "name")
+            } - {""}
+            if not coin.get("id") or not coin_terms:
+                continue
+            i = len(ids)
+            ids.append(coin["id"])
+            terms.append(tuple(coin_terms))
+            for term in coin_terms:
+                exact.setdefault(term, []).append(i)
+            for gram in set().union(*(_trigrams(term) for term in coin_terms)):
+                grams.setdefault(gram, []).append(i)
+
+        postings = {gram: np.array(members, dtype=np.int32) for gram, members in grams.items()}
+        # Swap in one assignment so concurrent lookups see either the old or the new index
+        self._index = (ids, terms, exact, postings)
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._build(data.get("coins", []))
+            self.fetched_at = data.get("fetched_at", 0.0)
+        except Exception:
+            pass
+
+    def _save(self, coins: List[Dict]):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"fetched_at": self.fetched_at, "coins": coins}, f)
+        os.replace(tmp, self.path)
+
+
+_coin_index = None
+_coin_index_lock = threading.Lock()
+
+
+def get_coin_index() -> CoinIndex:
+    """Process-wide coin index, loaded from disk once"""
+    global _coin_index
+    with _coin_index_lock:
+        if _coin_index is None:
+            _coin_index = CoinIndex()
+        return _coin_index
@@ -0,0 +1,159 @@
+"""Persistent LLM completion cache backed by SQLite - keyed by model plus normalized messages"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from llm_stream_module import stream_chat
+
+DEFAULT_COMPLETION_DB = "completion_cache.db"
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+def normalize_messages(messages: List[Dict]) -> List[Dict]:
+    """Role/content pairs with whitespace collapsed and text case-folded.
+
+    Non-text content (e.g. image parts) is kept as-is, so two charts only share a key
+    when their bytes are identical.
+    """
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            content = " ".join(content.split()).casefold()
+        normalized.append({"role": message.get("role"), "content": content})
+    return normalized
+
+
+def completion_key(model: str, messages: List[Dict], **params) -> str:
+    """SHA-256 of the model, normalized messages and any generation parameters"""
+    payload = {"model": model, "messages": normalize_messages(messages), "params": params}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """Completed LLM responses stored on disk, so repeated prompts skip the API across restarts.
+
+    Entries expire `ttl` seconds after they were written. Once the stored text exceeds
+    `max_bytes` the least recently used entries are evicted. Only completions that streamed
+    through to the end are stored - errors and abandoned streams never are.
+    """
+
+    def __init__(self, path: str = DEFAULT_COMPLETION_DB, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the cache safe across Streamlit threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response text, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT response, created_at FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.metrics["misses"] += 1
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl:
+                conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.metrics["expired"] += 1
+                self.metrics["misses"] += 1
+                return None
+            conn.execute("UPDATE completions SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self.metrics["hits"] += 1
+            return response
+
+    def put(self, key: str, model: str, response: str):
+        """Store a completed response and evict least recently used entries past max_bytes"""
+        size = len(response.encode("utf-8"))
+        if not response or size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, model, response, size, now, now)
+            )
+            self.metrics["stores"] += 1
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        self.metrics["expired"] += conn.execute(
+            "DELETE FROM completions WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM completions ORDER BY last_used"):
+            victims.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM completions WHERE key = ?", victims)
+        self.metrics["evictions"] += len(victims)
+
+    def stream(self, messages: List[Dict], model: str, api_key: str, max_tokens: Optional[int] = None,
+               **kwargs) -> Iterator[str]:
+        """stream_chat served from the cache when possible; a hit is yielded in one chunk"""
+        key = completion_key(model, messages, max_tokens=max_tokens)
+        cached = self.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in stream_chat(messages, model, api_key, max_tokens=max_tokens, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self.put(key, model, "".join(chunks))
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM completions")
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for this process plus the stored entry count and size"""
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        with self._lock:
+            return {**self.metrics, "entries": entries, "bytes": size}
+
+
+_completion_cache = None
+_completion_cache_lock = threading.Lock()
+
+
+def get_completion_cache() -> CompletionCache:
+    """Process-wide completion cache, opened once"""
+    global _completion_cache
+    with _completion_cache_lock:
+        if _completion_cache is None:
+            _completion_cache = CompletionCache()
+        return _completion_cache
@@ -0,0 +1,145 @@
+"""Token-budgeted LLM context - recent turns verbatim, older tool outputs compacted, oldest dropped"""
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+DEFAULT_CONTEXT_TOKENS = 3000
+KEEP_FULL_MESSAGES = 4
+MAX_COMPACT_MESSAGE_TOKENS = 300
+RENDER_CACHE_SIZE = 2048
+
+
+def count_tokens(text: str) -> int:
+    """Exact cl100k token count when tiktoken is installed, ~4 characters per token otherwise"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _clip(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _encoding is not None:
+        return _encoding.decode(_encoding.encode(text, disallowed_special=())[:max_tokens]) + " …[truncated]"
+    return text[:max_tokens * 4] + " …[truncated]"
+
+
+def render_message(entry: Dict, compact: bool = False) -> Dict:
+    """API message for one conversation entry.
+
+    Full rendering carries prediction plans, tokenomics explanations and every headline;
+    compact rendering keeps only the facts a follow-up question needs.
+    """
+    role = entry.get("role", "user")
+    if role in ("system", "user"):
+        content = entry.get("content", "")
+        if compact and role == "user":
+            content = _clip(content, MAX_COMPACT_MESSAGE_TOKENS)
+        return {"role": role, "content": content}
+
+    kind = entry.get("kind", "text")
+    if kind == "tokenomics":
+        data = entry.get("data") or {}
+        explanation = entry.get("ai_explanation", "")
+        summary = f"Comprehensive tokenomics analysis completed for {entry.get('token_name', 'token')}."
+        if compact:
+            facts = [f"{field.replace('_', ' ')}: {data[field]}" for field in
+                     ("Current_Price", "Market_Cap", "Risk_Level", "Investment_Recommendation") if data.get(field)]
+            content = summary + ("\n" + "; ".join(facts) if facts else "")
+        else:
+            content = f"{summary}\n\nAI Explanation: {explanation}" if explanation else summary
+    elif kind == "prediction":
+        data = entry.get("data") or {}
+        content = f"Prediction for {data.get('symbol','')}: Bias {data.get('bias','')}, Strength {data.get('strength','')}"
+        if compact:
+            content = f"{content} ({data.get('tf','')} timeframe; full plan omitted)"
+        else:
+            content = f"{content}\nPlan:\n{data.get('plan','')}"
+    elif kind == "news":
+        headlines = entry.get("data") or []
+        if compact and len(headlines) > 3:
+            headlines = headlines[:3] + [f"(+{len(headlines) - 3} more headlines)"]
+        content = "News headlines:\n" + "\n".join(headlines)
+        if compact:
+            content = _clip(content, MAX_COMPACT_MESSAGE_TOKENS)
+    else:
+        content = entry.get("content", "")
+        if compact:
+            content = _clip(content, MAX_COMPACT_MESSAGE_TOKENS)
+    return {"role": "assistant", "content": content}
+
+
+class ContextBuilder:
+    """Builds the message list sent to the LLM within a token budget.
+
+    System messages are always sent. Walking back from the newest entry, the last
+    `keep_full` entries are rendered in full and older ones compacted; entries stop being
+    added once the budget is spent. Rendered messages and their token counts are cached per
+    conversation entry, so each turn only renders the entries that are new.
+    """
+
+    def __init__(self, max_tokens: int = DEFAULT_CONTEXT_TOKENS, keep_full: int = KEEP_FULL_MESSAGES):
+        self.max_tokens = max_tokens
+        self.keep_full = keep_full
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, conversation: List[Dict], max_tokens: Optional[int] = None) -> List[Dict]:
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        system, selected = [], []
+        for entry in conversation:
+            if entry.get("role") == "system":
+                message, tokens = self._render(entry, False)
+                system.append(message)
+                budget -= tokens
+
+        turns = [entry for entry in conversation if entry.get("role") != "system"]
+        for age, entry in enumerate(reversed(turns)):
+            message, tokens = self._render(entry, age >= self.keep_full)
+            if tokens > budget and age < self.keep_full:
+                # A recent entry that doesn't fit verbatim may still fit compacted
+                message, tokens = self._render(entry, True)
+            if tokens > budget and selected:
+                break
+            selected.append(message)
+            budget -= tokens
+
+        return system + selected[::-1]
+
+    def _render(self, entry: Dict, compact: bool) -> Tuple[Dict, int]:
+        key = (id(entry), compact)
+        with self._lock:
+            cached = self._cache.get(key)
+            # Holding the entry keeps its id from being reused; a new content object means it was edited
+            if cached is not None and cached[0] is entry and cached[1] is entry.get("content"):
+                self._cache.move_to_end(key)
+                return cached[2], cached[3]
+
+        message = render_message(entry, compact)
+        tokens = count_tokens(message["content"]) + 4  # Role and message framing
+        with self._lock:
+            self._cache[key] = (entry, entry.get("content"), message, tokens)
+            while len(self._cache) > RENDER_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return message, tokens
+
+
+_context_builder = None
+_context_builder_lock = threading.Lock()
+
+
+def get_context_builder() -> ContextBuilder:
+    """Process-wide builder, so the render cache is shared across reruns"""
+    global _context_builder
+    with _context_builder_lock:
+        if _context_builder is None:
+            _context_builder = ContextBuilder()
+        return _context_builder
@@ -0,0 +1,163 @@
+"""Process-wide JSON response cache - per-endpoint TTLs, LRU memory budget, stale-while-revalidate"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit_module import BACKGROUND, INTERACTIVE, get_rate_limiter
+from singleflight_module import get_single_flight
+
+# (path pattern, fresh seconds, extra seconds a stale copy may still be served while refreshing)
+COINGECKO_TTLS = [
+    (r"/coins/list$", 24 * 3600, 7 * 24 * 3600),
+    (r"/coins/markets$", 60, 600),
+    (r"/coins/[^/]+/market_chart$", 600, 3600),
+    (r"/coins/[^/]+/ohlc$", 300, 3600),
+    (r"/coins/[^/]+$", 120, 1800),
+]
+DEFAULT_TTL = (60, 300)
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+class _Entry:
+    __slots__ = ("data", "size", "fetched_at", "ttl", "stale_ttl")
+
+    def __init__(self, data, size: int, ttl: float, stale_ttl: float):
+        self.data = data
+        self.size = size
+        self.fetched_at = time.time()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class ResponseCache:
+    """Caches parsed JSON GET responses in memory, shared by every session in the process.
+
+    Fresh entries are served directly. Stale entries (past their TTL but inside the stale window)
+    are served immediately while one background refresh replaces them. If a refetch fails, a
+    stale copy is served rather than the error. Entries are evicted least-recently-used once
+    the raw payload sizes exceed `memory_budget` bytes. Returned objects are shared - treat them
+    as read-only.
+    """
+
+    def __init__(self, ttls: Optional[List[Tuple[str, float, float]]] = None,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET, max_refresh_workers: int = 4):
+        self.ttls = [(re.compile(pattern), ttl, stale_ttl) for pattern, ttl, stale_ttl in (ttls or [])]
+        self.memory_budget = memory_budget
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=max_refresh_workers, thread_name_prefix="cache-refresh")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_refresh_workers * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.metrics = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0, "evictions": 0}
+
+    def get_json(self, url: str, params: Optional[Dict] = None, timeout: float = 10):
+        """Cached GET returning the parsed JSON body"""
+        key = self._key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = entry.age()
+                if age <= entry.ttl:
+                    self._entries.move_to_end(key)
+                    self.metrics["hits"] += 1
+                    return entry.data
+                if age <= entry.ttl + entry.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.metrics["stale_hits"] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._refresher.submit(self._refresh, key, url, params, timeout)
+                    return entry.data
+            self.metrics["misses"] += 1
+
+        try:
+            # Concurrent misses for the same URL share one request
+            return get_single_flight().do(("http", key), self._fetch, key, url, params, timeout)
+        except Exception:
+            # Stale-if-error: an expired copy beats no answer
+            if entry is not None:
+                with self._lock:
+                    self.metrics["errors"] += 1
+                return entry.data
+            raise
+
+    def invalidate(self, url: Optional[str] = None, params: Optional[Dict] = None):
+        """Drop one entry, or everything when url is None"""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            entry = self._entries.pop(self._key(url, params), None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def stats(self) -> Dict:
+        """Hit/miss counters plus current size"""
+        with self._lock:
+            return {**self.metrics, "entries": len(self._entries), "bytes": self._bytes}
+
+    def _ttl_for(self, url: str) -> Tuple[float, float]:
+        path = url.split("?", 1)[0].rstrip("/")
+        for pattern, ttl, stale_ttl in self.ttls:
+            if pattern.search(path):
+                return ttl, stale_ttl
+        return DEFAULT_TTL
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict]) -> str:
+        if not params:
+            return url
+        return url + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+    def _fetch(self, key: str, url: str, params: Optional[Dict], timeout: float, priority: int = INTERACTIVE):
+        response = get_rate_limiter().request(self.session, "GET", url, priority=priority, params=params, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        ttl, stale_ttl = self._ttl_for(url)
+        self._store(key, _Entry(data, len(response.content), ttl, stale_ttl))
+        return data
+
+    def _refresh(self, key: str, url: str, params: Optional[Dict], timeout: float):
+        try:
+            self._fetch(key, url, params, timeout, priority=BACKGROUND)
+            with self._lock:
+                self.metrics["refreshes"] += 1
+        except Exception:
+            with self._lock:
+                self.metrics["errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key: str, entry: _Entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            if entry.size > self.memory_budget:
+                return
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.memory_budget:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.metrics["evictions"] += 1
+
+
+coingecko_cache = ResponseCache(COINGECKO_TTLS)
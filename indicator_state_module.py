@@ -0,0 +1,300 @@
+"""Incremental (streaming) version of TradingAnalyzer.add_comprehensive_indicators"""
+import math
+from collections import deque
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+def _div(a: float, b: float) -> float:
+    """Float division with pandas semantics (x/0 -> +-inf, 0/0 -> nan)"""
+    if b == 0:
+        return math.nan if a == 0 or math.isnan(a) else math.copysign(math.inf, a)
+    return a / b
+
+
+def _mean(values) -> float:
+    return sum(values) / len(values)
+
+
+class _EMA:
+    """Recursive ewm(adjust=False) with min_periods, as used by the ta library"""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = math.nan
+        self.count = 0
+
+    def step(self, x: float):
+        """Return (new value, new count, output) without mutating"""
+        if math.isnan(x):
+            return self.value, self.count, self.value if self.count >= self.min_periods else math.nan
+        value = x if self.count == 0 else (1 - self.alpha) * self.value + self.alpha * x
+        count = self.count + 1
+        return value, count, value if count >= self.min_periods else math.nan
+
+
+class _Window:
+    """Fixed-size rolling window that can be evaluated with a candidate value before committing"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+
+    def with_value(self, x: float) -> list:
+        values = list(self.values)
+        values.append(x)
+        return values[-self.size:]
+
+
+class IndicatorState:
+    """Carries the recursive indicator states so each new candle costs O(1).
+
+    Produces the same columns as add_comprehensive_indicators, matching the ta library
+    (including its zero-filled warm-up for ATR/ADX/DI). `update` folds a closed candle
+    into the state; `preview` evaluates a still-forming candle without touching it.
+    """
+
+    WARMUP_BARS = 50  # Longest lookback (EMA 50 / SMA 50)
+
+    def __init__(self):
+        self.bars = 0
+        self.prev_close = math.nan
+        self.prev_high = math.nan
+        self.prev_low = math.nan
+        self.latest: Optional[Dict] = None
+
+        # RSI: Wilder smoothing of up/down moves
+        self.rsi = {w: (_EMA(1 / w, w), _EMA(1 / w, w)) for w in (14, 21)}
+
+        # Moving averages
+        self.ema = {w: _EMA(2 / (w + 1), w) for w in (9, 21, 50, 12, 26)}
+        self.macd_signal = _EMA(2 / (9 + 1), 9)
+
+        # Rolling windows
+        self.closes = _Window(50)
+        self.highs = _Window(14)
+        self.lows = _Window(14)
+        self.stoch_k = _Window(3)
+        self.volumes = _Window(20)
+        self.mfv = _Window(20)
+        self.tp = _Window(20)
+        self.tp_high = _Window(20)
+        self.tp_low = _Window(20)
+
+        # ATR (window 14): seeded with the mean of the first 14 true ranges
+        self.atr = 0.0
+        self.atr_seed = 0.0
+
+        # ADX (window 14): Wilder sums of TR, +DM, -DM and the DX seed list
+        self.adx_trs = 0.0
+        self.adx_dip = 0.0
+        self.adx_din = 0.0
+        self.adx_dx = []
+        self.adx = 0.0
+
+        self.obv = 0.0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """Warm a state up from an OHLCV history (one O(n) pass)"""
+        state = cls()
+        for open_time, o, h, l, c, v in zip(df.index, df["Open"], df["High"], df["Low"], df["Close"], df["Volume"]):
+            state.update({"Open Time": open_time, "Open": o, "High": h, "Low": l, "Close": c, "Volume": v})
+        return state
+
+    @property
+    def ready(self) -> bool:
+        """True once the latest row would survive add_comprehensive_indicators' dropna"""
+        return self.latest is not None and not any(
+            isinstance(v, float) and math.isnan(v) for v in self.latest.values()
+        )
+
+    def update(self, candle: Dict) -> Dict:
+        """Fold a closed candle into the state and return its indicator row"""
+        row, commit = self._step(candle)
+        commit()
+        self.latest = row
+        return row
+
+    def preview(self, candle: Dict) -> Dict:
+        """Indicator row for a still-forming candle, leaving the state untouched"""
+        row, _ = self._step(candle)
+        return row
+
+    def latest_row(self) -> Optional[pd.Series]:
+        """Latest committed row as a Series, shaped like df.iloc[-1] after add_comprehensive_indicators"""
+        if self.latest is None:
+            return None
+        row = dict(self.latest)
+        return pd.Series(row, name=row.pop("Open Time", None))
+
+    def _step(self, candle: Dict):
+        o = float(candle["Open"])
+        h = float(candle["High"])
+        l = float(candle["Low"])
+        c = float(candle["Close"])
+        v = float(candle["Volume"])
+        b = self.bars
+        pc = self.prev_close
+        changes = {}
+        row = {"Open Time": candle.get("Open Time"), "Open": o, "High": h, "Low": l, "Close": c, "Volume": v}
+
+        # Momentum: RSI
+        diff = c - pc
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        for w, (ema_up, ema_down) in self.rsi.items():
+            up_state = ema_up.step(up)
+            down_state = ema_down.step(down)
+            changes[("rsi", w)] = (up_state, down_state)
+            avg_up, avg_down = up_state[2], down_state[2]
+            if math.isnan(avg_down):
+                row[f"RSI_{w}"] = math.nan
+            else:
+                row[f"RSI_{w}"] = 100.0 if avg_down == 0 else 100 - 100 / (1 + _div(avg_up, avg_down))
+
+        # Stochastic and Williams %R (14)
+        highs = self.highs.with_value(h)
+        lows = self.lows.with_value(l)
+        if len(highs) == 14:
+            hh, ll = max(highs), min(lows)
+            stoch_k = 100 * _div(c - ll, hh - ll)
+            williams_r = -100 * _div(hh - c, hh - ll)
+        else:
+            stoch_k = williams_r = math.nan
+        stoch_ks = self.stoch_k.with_value(stoch_k)
+        row["Stoch_K"] = stoch_k
+        row["Stoch_D"] = _mean(stoch_ks) if len(stoch_ks) == 3 else math.nan
+        row["Williams_R"] = williams_r
+
+        # Trend: EMAs / SMAs / MACD
+        ema_out = {}
+        for w, ema in self.ema.items():
+            changes[("ema", w)] = ema.step(c)
+            ema_out[w] = changes[("ema", w)][2]
+        row["EMA_9"], row["EMA_21"], row["EMA_50"] = ema_out[9], ema_out[21], ema_out[50]
+
+        closes = self.closes.with_value(c)
+        last_20 = closes[-20:]
+        row["SMA_20"] = _mean(last_20) if len(last_20) == 20 else math.nan
+        row["SMA_50"] = _mean(closes) if len(closes) == 50 else math.nan
+
+        macd = ema_out[12] - ema_out[26]
+        changes["macd_signal"] = self.macd_signal.step(macd)
+        row["MACD"] = macd
+        row["MACD_Signal"] = changes["macd_signal"][2]
+        row["MACD_Histogram"] = macd - row["MACD_Signal"]
+
+        # True range (ATR takes high-low on the very first bar)
+        tr = h - l if b == 0 else max(h - l, abs(h - pc), abs(l - pc))
+
+        # ADX / DI (14) with the ta library's seeding and zero-filled warm-up
+        trs, dip, din, adx = self.adx_trs, self.adx_dip, self.adx_din, self.adx
+        dx_seed = self.adx_dx
+        di_plus = di_minus = 0.0
+        if b >= 1:
+            diff_up = h - self.prev_high
+            diff_down = self.prev_low - l
+            pos = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+            neg = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+            if b <= 14:
+                trs, dip, din = trs + tr, dip + pos, din + neg
+            else:
+                trs = trs - trs / 14 + tr
+                dip = dip - dip / 14 + pos
+                din = din - din / 14 + neg
+            if b >= 14:
+                plus = 100 * dip / trs if trs != 0 else 0.0
+                minus = 100 * din / trs if trs != 0 else 0.0
+                dx = 100 * abs((plus - minus) / (plus + minus)) if plus + minus != 0 else 0.0
+                if b > 14:
+                    di_plus, di_minus = plus, minus
+                if b < 2 * 14 - 1:
+                    dx_seed = dx_seed + [dx]
+                elif b == 2 * 14 - 1:
+                    dx_seed = dx_seed + [dx]
+                    adx = _mean(dx_seed)
+                else:
+                    adx = (adx * (14 - 1) + dx) / 14
+        row["ADX"] = adx if b >= 2 * 14 - 1 else 0.0
+        row["DI_Plus"] = di_plus
+        row["DI_Minus"] = di_minus
+
+        # Volatility: Bollinger Bands (20, 2)
+        if len(last_20) == 20:
+            mavg = row["SMA_20"]
+            mstd = math.sqrt(sum((x - mavg) ** 2 for x in last_20) / 20)
+            row["BB_Upper"], row["BB_Middle"], row["BB_Lower"] = mavg + 2 * mstd, mavg, mavg - 2 * mstd
+        else:
+            row["BB_Upper"] = row["BB_Middle"] = row["BB_Lower"] = math.nan
+        row["BB_Width"] = _div(row["BB_Upper"] - row["BB_Lower"], row["BB_Middle"]) * 100
+        row["BB_Position"] = _div(c - row["BB_Lower"], row["BB_Upper"] - row["BB_Lower"])
+
+        # Keltner Channels (original version, window 20)
+        tps = self.tp.with_value((h + l + c) / 3.0)
+        tp_highs = self.tp_high.with_value((4 * h - 2 * l + c) / 3.0)
+        tp_lows = self.tp_low.with_value((-2 * h + 4 * l + c) / 3.0)
+        row["KC_Upper"] = _mean(tp_highs)
+        row["KC_Lower"] = _mean(tp_lows)
+        row["KC_Middle"] = _mean(tps) if len(tps) == 20 else math.nan
+
+        # ATR (14)
+        atr_seed, atr = self.atr_seed, self.atr
+        if b < 14:
+            atr_seed += tr
+            atr = atr_seed / 14 if b == 14 - 1 else 0.0
+        else:
+            atr = (atr * (14 - 1) + tr) / 14
+        row["ATR"] = atr
+        row["ATR_Percent"] = _div(atr, c) * 100
+
+        # Volume
+        volumes = self.volumes.with_value(v)
+        row["Volume_SMA"] = _mean(volumes) if len(volumes) == 20 else math.nan
+        row["Volume_Ratio"] = _div(v, row["Volume_SMA"])
+        obv = self.obv + (-v if c < pc else v)
+        row["OBV"] = obv
+        mfv = 0.0 if h == l else ((c - l) - (h - c)) / (h - l) * v
+        mfvs = self.mfv.with_value(mfv)
+        row["CMF"] = _div(sum(mfvs), sum(volumes)) if len(mfvs) == 20 else math.nan
+
+        # Price action
+        row["Body_Size"] = abs(c - o) / o * 100
+        row["Upper_Wick"] = (h - max(o, c)) / o * 100
+        row["Lower_Wick"] = (min(o, c) - l) / o * 100
+        row["Total_Range"] = (h - l) / o * 100
+
+        # Support/Resistance
+        pivot = (h + l + c) / 3
+        row["Pivot"] = pivot
+        row["R1"] = 2 * pivot - l
+        row["S1"] = 2 * pivot - h
+
+        # Rate of change
+        row["ROC_5"] = (_div(c, closes[-6]) - 1) * 100 if len(closes) >= 6 else math.nan
+        row["ROC_14"] = (_div(c, closes[-15]) - 1) * 100 if len(closes) >= 15 else math.nan
+
+        def commit():
+            self.bars = b + 1
+            self.prev_close, self.prev_high, self.prev_low = c, h, l
+            for w, (ema_up, ema_down) in self.rsi.items():
+                (ema_up.value, ema_up.count, _), (ema_down.value, ema_down.count, _) = changes[("rsi", w)]
+            for w, ema in self.ema.items():
+                ema.value, ema.count, _ = changes[("ema", w)]
+            self.macd_signal.value, self.macd_signal.count, _ = changes["macd_signal"]
+            self.closes.values.append(c)
+            self.highs.values.append(h)
+            self.lows.values.append(l)
+            self.stoch_k.values.append(stoch_k)
+            self.volumes.values.append(v)
+            self.mfv.values.append(mfv)
+            self.tp.values.append(tps[-1])
+            self.tp_high.values.append(tp_highs[-1])
+            self.tp_low.values.append(tp_lows[-1])
+            self.atr_seed, self.atr = atr_seed, atr
+            self.adx_trs, self.adx_dip, self.adx_din, self.adx_dx, self.adx = trs, dip, din, dx_seed, adx
+            self.obv = obv
+
+        return row, commit
@@ -0,0 +1,318 @@
+"""Live kline streaming - rolling candle buffers fed by the Binance websocket kline stream"""
+import json
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import pandas as pd
+
+from indicator_state_module import IndicatorState
+
+try:
+    import websocket  # websocket-client
+except Exception:
+    websocket = None
+
+BINANCE_WS_URL = "wss://stream.binance.com:9443/ws"
+DEFAULT_BUFFER_SIZE = 1000
+DEFAULT_HISTORY_LIMIT = 500
+DEFAULT_IDLE_TIMEOUT = 120  # Seconds a feed keeps streaming after its last reader
+
+
+def parse_kline_message(message) -> Optional[Dict]:
+    """Turn a kline stream payload (raw or combined-stream) into a candle dict, None for anything else"""
+    if isinstance(message, (str, bytes)):
+        message = json.loads(message)
+    if "data" in message:
+        message = message["data"]
+    kline = message.get("k")
+    if message.get("e") != "kline" or not kline:
+        return None
+    return {
+        "Open Time": pd.Timestamp(int(kline["t"]), unit="ms"),
+        "Open": float(kline["o"]),
+        "High": float(kline["h"]),
+        "Low": float(kline["l"]),
+        "Close": float(kline["c"]),
+        "Volume": float(kline["v"]),
+        "Closed": bool(kline["x"])
+    }
+
+
+class LiveKlineFeed:
+    """Rolling in-memory candle buffer for one symbol/interval, kept current by the kline stream.
+
+    History is warmed up once over REST; after that every websocket update goes through an
+    IndicatorState (update for closed candles, preview for the forming one) and the analyzer's
+    confluence rules, so reading the live bias never re-fetches or recomputes the frame.
+    """
+
+    def __init__(self, analyzer, symbol: str, interval: str, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 history_limit: int = DEFAULT_HISTORY_LIMIT, ws_url: str = BINANCE_WS_URL):
+        self.analyzer = analyzer
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.history_limit = history_limit
+        self.url = f"{ws_url.rstrip('/')}/{self.symbol.lower()}@kline_{interval}"
+
+        self.buffer = deque(maxlen=buffer_size)
+        self.state = IndicatorState()
+        self._committed_open = None  # Open Time of the last candle folded into the state
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._backoff = 1
+        self._thread = None
+        self._ws = None
+        self._opened_before = False
+
+        self.connected = False
+        self.messages = 0
+        self.last_error = None
+
+    def start(self, warm_up: bool = True):
+        """Warm the buffer up from REST history and start streaming in a background thread"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            if websocket is None:
+                raise Exception("websocket-client is not installed (pip install websocket-client)")
+            if warm_up:
+                self.warm_up()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"kline-{self.symbol}-{self.interval}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Close the stream and stop reconnecting"""
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def warm_up(self, df: Optional[pd.DataFrame] = None):
+        """Seed the buffer and indicator state from an OHLCV frame (fetched over REST when None).
+
+        Only real binance.com klines are fetched - fabricated fallback candles joined onto the
+        stream would corrupt every indicator - so this raises when Binance is unreachable.
+        """
+        if df is None:
+            df = self.analyzer.fetch_exchange_ohlcv(symbol=self.symbol, interval=self.interval, limit=self.history_limit)
+            if df is None or df.empty:
+                raise Exception(f"No Binance klines for {self.symbol} {self.interval}")
+        candles = [
+            {"Open Time": ts, "Open": o, "High": h, "Low": l, "Close": c, "Volume": v}
+            for ts, o, h, l, c, v in zip(df.index, df["Open"], df["High"], df["Low"], df["Close"], df["Volume"])
+        ]
+        # The newest REST candle is still forming, so it stays uncommitted until the stream closes it
+        with self._lock:
+            self.buffer.clear()
+            self.state = IndicatorState()
+            self._committed_open = None
+            for candle in candles:
+                self.buffer.append(candle)
+            for candle in candles[:-1]:
+                self._commit(candle)
+            if candles:
+                self._refresh(self.state.preview(candles[-1]))
+
+    def on_candle(self, candle: Dict):
+        """Apply one kline update (closed or still forming) to the buffer, state and bias"""
+        candle = dict(candle)
+        closed = candle.pop("Closed", False)
+        open_time = candle["Open Time"]
+
+        with self._lock:
+            last = self.buffer[-1] if self.buffer else None
+            if last is not None and open_time < last["Open Time"]:
+                return  # Stale update from before a reconnect
+            if last is not None and open_time == last["Open Time"]:
+                self.buffer[-1] = candle
+            else:
+                # A missed close message must not leave the previous candle out of the state
+                if last is not None and last["Open Time"] != self._committed_open:
+                    self._commit(last)
+                self.buffer.append(candle)
+
+            if closed:
+                if open_time != self._committed_open:
+                    row = self._commit(candle)
+                else:
+                    row = self.state.latest
+            else:
+                row = self.state.preview(candle)
+            self._refresh(row)
+
+    def on_message(self, message):
+        """Websocket message handler (also used to replay recorded klines)"""
+        candle = parse_kline_message(message)
+        if candle is not None:
+            self.messages += 1
+            self.on_candle(candle)
+
+    def snapshot(self) -> Optional[Dict]:
+        """Latest bias, strength, confluences and indicator row"""
+        with self._lock:
+            return dict(self._snapshot) if self._snapshot else None
+
+    def frame(self) -> pd.DataFrame:
+        """Current candle buffer as an OHLCV frame indexed by Open Time"""
+        with self._lock:
+            df = pd.DataFrame(list(self.buffer))
+        if df.empty:
+            return df
+        return df.set_index("Open Time")
+
+    def _commit(self, candle: Dict) -> Dict:
+        self._committed_open = candle["Open Time"]
+        return self.state.update(candle)
+
+    def _refresh(self, row: Dict):
+        row = dict(row)
+        open_time = row.pop("Open Time", None)
+        latest = pd.Series(row, name=open_time)
+        if any(isinstance(v, float) and math.isnan(v) for v in row.values()):
+            bias, strength, confluences = "Warming Up", 0, {'bullish': [], 'bearish': [], 'neutral': []}
+        else:
+            confluences = self.analyzer.analyze_latest_row(latest)
+            bias, strength = self.analyzer.calculate_confluence_strength(confluences)
+        self._snapshot = {
+            "symbol": self.symbol,
+            "tf": self.interval,
+            "bias": bias,
+            "strength": strength,
+            "confluences": confluences,
+            "latest": latest,
+            "updated_at": time.time(),
+            "connected": self.connected
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=lambda ws, message: self.on_message(message),
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+            self._ws.run_forever(ping_interval=180, ping_timeout=10)
+            if self._stop.is_set():
+                break
+            print(f"⚠️ Kline stream {self.symbol} {self.interval} dropped, reconnecting in {self._backoff}s")
+            self._stop.wait(self._backoff)
+            self._backoff = min(self._backoff * 2, 60)
+
+    def _on_open(self, ws):
+        if self._opened_before:
+            # Candles that closed while disconnected never reached on_candle - re-seed from REST
+            # so the indicator state never treats non-adjacent candles as consecutive
+            try:
+                self.warm_up()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠️ Kline stream {self.symbol} {self.interval} backfill failed: {str(e)}")
+                ws.close()
+                return
+        self._opened_before = True
+        self.connected = True
+        self._backoff = 1
+        print(f"✅ Kline stream connected: {self.symbol} {self.interval}")
+
+    def _on_error(self, ws, error):
+        self.last_error = str(error)
+
+    def _on_close(self, ws, status_code, message):
+        self.connected = False
+
+
+class LiveKlineHub:
+    """One LiveKlineFeed per symbol/interval, shared by every caller in the process.
+
+    Feeds nobody has asked for in idle_timeout seconds are stopped by a background reaper,
+    so closed tabs and cleared toggles don't leave websocket threads running.
+    """
+
+    def __init__(self, analyzer=None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, **feed_options):
+        self._analyzer = analyzer
+        self.idle_timeout = idle_timeout
+        self.feed_options = feed_options
+        self._feeds = {}
+        self._last_used = {}
+        self._reaper = None
+        self._lock = threading.Lock()
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            import betterpredictormodule
+            self._analyzer = betterpredictormodule.get_trading_analyzer()
+        return self._analyzer
+
+    def feed(self, symbol: str, interval: str) -> LiveKlineFeed:
+        """Get the running feed for a symbol/interval, starting it on first use"""
+        key = (symbol.upper(), interval)
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is None:
+                feed = LiveKlineFeed(self.analyzer, symbol, interval, **self.feed_options)
+                self._feeds[key] = feed
+            self._last_used[key] = time.monotonic()
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="kline-hub-reaper", daemon=True)
+                self._reaper.start()
+        return feed.start()
+
+    def stop(self, symbol: str, interval: str):
+        key = (symbol.upper(), interval)
+        with self._lock:
+            feed = self._feeds.pop(key, None)
+            self._last_used.pop(key, None)
+        if feed is not None:
+            feed.stop()
+
+    def stop_all(self):
+        with self._lock:
+            feeds, self._feeds = list(self._feeds.values()), {}
+            self._last_used = {}
+        for feed in feeds:
+            feed.stop()
+
+    def stop_idle(self) -> int:
+        """Stop every feed not requested within idle_timeout; returns how many were stopped"""
+        now = time.monotonic()
+        with self._lock:
+            idle = [key for key, used in self._last_used.items() if now - used > self.idle_timeout]
+            feeds = [self._feeds.pop(key) for key in idle if key in self._feeds]
+            for key in idle:
+                del self._last_used[key]
+        for feed in feeds:
+            feed.stop()
+        return len(feeds)
+
+    def _reap(self):
+        while True:
+            time.sleep(min(self.idle_timeout, 30))
+            self.stop_idle()
+            with self._lock:
+                if not self._feeds:
+                    self._reaper = None  # The next feed() starts a fresh reaper
+                    return
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_live_hub() -> LiveKlineHub:
+    """Process-wide hub, so Streamlit reruns keep reusing the same streams"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = LiveKlineHub()
+        return _hub
@@ -0,0 +1,80 @@
+"""Streaming OpenRouter client - chat completions over server-sent events, yielded token by token"""
+import json
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit_module import get_rate_limiter
+
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# (connect, read) - the read timeout bounds the gap between chunks, not the whole generation
+DEFAULT_TIMEOUT = (10, 60)
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+_session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+
+
+def iter_sse_data(lines: Iterator[str]) -> Iterator[str]:
+    """Payloads of the `data:` fields of an SSE stream, one per event.
+
+    Comment lines (`: keep-alive`, OpenRouter's `: OPENROUTER PROCESSING`) and other fields
+    are skipped; multi-line data fields are joined with newlines as the SSE spec requires.
+    """
+    data = []
+    for line in lines:
+        if line is None:
+            continue
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.rstrip("\r")
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+
+def stream_chat(messages: List[Dict], model: str, api_key: str, max_tokens: Optional[int] = None,
+                url: str = OPENROUTER_URL, timeout=DEFAULT_TIMEOUT) -> Iterator[str]:
+    """Yield completion text deltas as OpenRouter produces them"""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream"
+    }
+    payload = {"model": model, "messages": messages, "stream": True}
+    if max_tokens:
+        payload["max_tokens"] = max_tokens
+
+    response = get_rate_limiter().request(_session, "POST", url, headers=headers, json=payload,
+                                          timeout=timeout, stream=True)
+    with response:
+        response.raise_for_status()
+        # chunk_size=None hands over bytes as they arrive instead of waiting to fill a 512-byte block
+        for data in iter_sse_data(response.iter_lines(chunk_size=None)):
+            if data.strip() == "[DONE]":
+                break
+            chunk = json.loads(data)
+            if "error" in chunk:
+                error = chunk["error"]
+                raise Exception(error.get("message", error) if isinstance(error, dict) else error)
+            for choice in chunk.get("choices", []):
+                content = (choice.get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+
+def complete_chat(messages: List[Dict], model: str, api_key: str, max_tokens: Optional[int] = None,
+                  url: str = OPENROUTER_URL, timeout=DEFAULT_TIMEOUT) -> str:
+    """Whole completion text, streamed under the hood"""
+    return "".join(stream_chat(messages, model, api_key, max_tokens=max_tokens, url=url, timeout=timeout))
@@ -0,0 +1,117 @@
+"""Multi-timeframe view - one base-resolution fetch, coarser intervals aggregated lazily in memory"""
+import threading
+from functools import reduce
+from math import gcd
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+import betterpredictormodule
+from betterpredictormodule import INTERVAL_MINUTES
+from resample_module import downsample_ohlcv
+
+
+def base_interval_for(intervals: Iterable[str]) -> str:
+    """Coarsest interval every requested interval is a whole multiple of"""
+    minutes = reduce(gcd, (INTERVAL_MINUTES[interval] for interval in intervals))
+    for interval, length in INTERVAL_MINUTES.items():
+        if length == minutes:
+            return interval
+    return "1m"
+
+
+class MultiTimeframeView:
+    """OHLCV frames for several intervals of one symbol, all derived from a single fetch.
+
+    Nothing touches the network until a frame is first needed; then the base interval is fetched
+    once (deep enough for `limit` candles of the coarsest interval) and every other interval is
+    aggregated from it on first access. Indicators and confluence analysis are cached per interval.
+    """
+
+    def __init__(self, symbol: str, intervals: Iterable[str] = ("15m", "1h", "4h"), limit: int = 200,
+                 analyzer=None, base_interval: Optional[str] = None):
+        self.symbol = symbol.upper()
+        self.intervals = list(intervals)
+        unknown = [interval for interval in self.intervals if interval not in INTERVAL_MINUTES]
+        if unknown:
+            raise Exception(f"Unsupported interval(s): {', '.join(unknown)}")
+
+        self.limit = limit
+        self.analyzer = analyzer or betterpredictormodule.get_trading_analyzer()
+        self.base_interval = base_interval or base_interval_for(self.intervals)
+        self._base = None
+        self._frames = {}
+        self._indicators = {}
+        self._analysis = {}
+        self._lock = threading.RLock()
+
+    @property
+    def base(self) -> pd.DataFrame:
+        """Base-resolution candles, fetched on first use"""
+        with self._lock:
+            if self._base is None:
+                factor = max(INTERVAL_MINUTES[interval] for interval in self.intervals) // INTERVAL_MINUTES[self.base_interval]
+                # One extra coarse bucket covers a partial leading candle
+                total = (self.limit + 1) * factor
+                self._base = self.analyzer.fetch_binance_history(self.symbol, self.base_interval, total)
+            return self._base
+
+    def frame(self, interval: str) -> pd.DataFrame:
+        """OHLCV frame for one interval, aggregated from the base on first access"""
+        with self._lock:
+            if interval not in self._frames:
+                minutes = INTERVAL_MINUTES[interval]
+                if minutes % INTERVAL_MINUTES[self.base_interval]:
+                    raise Exception(f"{interval} is not a multiple of the base interval {self.base_interval}")
+                if interval == self.base_interval:
+                    df = self.base
+                else:
+                    df = downsample_ohlcv(self.base, minutes)
+                self._frames[interval] = df.tail(self.limit)
+            return self._frames[interval]
+
+    __getitem__ = frame
+
+    def indicators(self, interval: str) -> pd.DataFrame:
+        """Frame with add_comprehensive_indicators applied"""
+        with self._lock:
+            if interval not in self._indicators:
+                self._indicators[interval] = self.analyzer.add_comprehensive_indicators(self.frame(interval).copy())
+            return self._indicators[interval]
+
+    def analysis(self, interval: str) -> Dict:
+        """Bias, strength, confluences and latest row for one interval"""
+        with self._lock:
+            if interval not in self._analysis:
+                confluences, latest = self.analyzer.generate_comprehensive_analysis(self.indicators(interval))
+                bias, strength = self.analyzer.calculate_confluence_strength(confluences)
+                self._analysis[interval] = {
+                    "bias": bias,
+                    "strength": strength,
+                    "confluences": confluences,
+                    "latest": latest
+                }
+            return self._analysis[interval]
+
+    def confluence(self) -> Dict:
+        """MTF agreement - every interval's bias, and whether they all point the same way"""
+        biases = {interval: self.analysis(interval)["bias"] for interval in self.intervals}
+        bullish = sum(bias == "Bullish Bias" for bias in biases.values())
+        bearish = sum(bias == "Bearish Bias" for bias in biases.values())
+
+        if bullish == len(biases):
+            agreement = "Bullish Alignment"
+        elif bearish == len(biases):
+            agreement = "Bearish Alignment"
+        else:
+            agreement = "Mixed"
+
+        return {
+            "symbol": self.symbol,
+            "base_interval": self.base_interval,
+            "biases": biases,
+            "strengths": {interval: self.analysis(interval)["strength"] for interval in self.intervals},
+            "bullish": bullish,
+            "bearish": bearish,
+            "agreement": agreement
+        }
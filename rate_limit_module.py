@@ -0,0 +1,202 @@
+"""Process-wide outbound rate-limit governor - per-provider token buckets, 429/Retry-After backoff, priorities"""
+import heapq
+import itertools
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# Lower value = served first. Interactive clicks always overtake background refreshes.
+INTERACTIVE = 0
+BACKGROUND = 10
+
+# (host pattern, bucket, tokens per second, burst, weight header, weight limit per minute)
+# Binance limits by IP across api/api1/api2..., so the mirrors share one weight budget.
+PROVIDER_LIMITS = [
+    (r"(^|\.)binance\.com$", "binance", 90, 600, "x-mbx-used-weight-1m", 6000),
+    (r"(^|\.)binance\.us$", "binance.us", 18, 120, "x-mbx-used-weight-1m", 1200),
+    (r"(^|\.)coingecko\.com$", "coingecko", 0.25, 6, None, None),
+    (r"(^|\.)newsapi\.org$", "newsapi", 1, 3, None, None),
+    (r"(^|\.)openrouter\.ai$", "openrouter", 1, 5, None, None),
+]
+DEFAULT_LIMIT = (5, 10, None, None)
+WEIGHT_SAFETY = 0.9  # Stop at 90% of a reported weight budget until the window rolls over
+MAX_BACKOFF = 120
+
+
+def binance_klines_weight(limit: int) -> int:
+    """Request weight Binance charges for /api/v3/klines"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class _Bucket:
+    def __init__(self, name: str, rate: float, burst: float, weight_header: Optional[str], weight_limit: Optional[int]):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.weight_header = weight_header
+        self.weight_limit = weight_limit
+        self.used_weight = 0
+        self.blocked_until = 0.0  # monotonic
+        self.strikes = 0  # Consecutive 429s without Retry-After, for exponential backoff
+        self.waiters = []
+        self.metrics = {"requests": 0, "waited": 0.0, "throttled": 0, "banned": 0}
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimiter:
+    """Coordinates every outbound API call in the process (and so every Streamlit session).
+
+    Each provider gets a token bucket sized just under its published limit. Callers queue per
+    provider by priority, then arrival order. A 429/418 response or a Retry-After header pauses
+    the whole provider, and Binance's used-weight header pauses it before the ban would trigger.
+    """
+
+    def __init__(self, limits=PROVIDER_LIMITS):
+        self.limits = [(re.compile(pattern), name, rate, burst, header, weight_limit)
+                       for pattern, name, rate, burst, header, weight_limit in limits]
+        self._buckets = {}
+        self._cond = threading.Condition()
+        self._sequence = itertools.count()
+
+    def _bucket(self, url: str) -> _Bucket:
+        host = (urlsplit(url).hostname or "").lower()
+        for pattern, name, rate, burst, header, weight_limit in self.limits:
+            if pattern.search(host):
+                break
+        else:
+            name, (rate, burst, header, weight_limit) = host, DEFAULT_LIMIT
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            bucket = self._buckets[name] = _Bucket(name, rate, burst, header, weight_limit)
+        return bucket
+
+    def acquire(self, url: str, weight: float = 1, priority: int = INTERACTIVE, timeout: Optional[float] = None):
+        """Block until the provider behind url can take a request of this weight"""
+        start = time.monotonic()
+        with self._cond:
+            bucket = self._bucket(url)
+            weight = min(weight, bucket.burst)
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(bucket.waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    if bucket.waiters[0] == ticket:
+                        if now < bucket.blocked_until:
+                            delay = bucket.blocked_until - now
+                        elif bucket.tokens >= weight:
+                            bucket.tokens -= weight
+                            bucket.metrics["requests"] += 1
+                            bucket.metrics["waited"] += now - start
+                            return
+                        else:
+                            delay = (weight - bucket.tokens) / bucket.rate
+                    else:
+                        delay = None  # Woken when the head of the queue is served
+                    if timeout is not None:
+                        remaining = start + timeout - now
+                        if remaining <= 0:
+                            raise Exception(f"Rate limit wait for {bucket.name} exceeded {timeout}s")
+                        delay = remaining if delay is None else min(delay, remaining)
+                    self._cond.wait(delay)
+            finally:
+                bucket.waiters.remove(ticket)
+                heapq.heapify(bucket.waiters)
+                self._cond.notify_all()
+
+    def observe(self, url: str, response):
+        """Update the provider's state from a response's status and headers"""
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        now = time.monotonic()
+        with self._cond:
+            bucket = self._bucket(url)
+
+            if bucket.weight_header and headers.get(bucket.weight_header):
+                try:
+                    bucket.used_weight = int(headers[bucket.weight_header])
+                except ValueError:
+                    pass
+                if bucket.weight_limit and bucket.used_weight >= bucket.weight_limit * WEIGHT_SAFETY:
+                    # Binance weight windows reset on the minute
+                    pause = 60 - time.time() % 60
+                    bucket.blocked_until = max(bucket.blocked_until, now + pause)
+                    bucket.metrics["throttled"] += 1
+                    print(f"⏳ {bucket.name} weight {bucket.used_weight}/{bucket.weight_limit} - pausing {pause:.0f}s")
+
+            retry_after = _retry_after_seconds(headers.get("retry-after"))
+            if response.status_code in (429, 418):
+                if retry_after is None:
+                    retry_after = min(MAX_BACKOFF, 2 ** bucket.strikes)
+                    bucket.strikes += 1
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+                bucket.tokens = 0
+                bucket.metrics["banned" if response.status_code == 418 else "throttled"] += 1
+                print(f"⏳ {bucket.name} returned {response.status_code} - pausing {retry_after:.0f}s")
+            else:
+                bucket.strikes = 0
+                if retry_after and response.status_code == 503:
+                    bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+            self._cond.notify_all()
+
+    def request(self, session, method: str, url: str, weight: float = 1, priority: int = INTERACTIVE,
+                wait_timeout: Optional[float] = None, **kwargs):
+        """session.request (a Session or the requests module) through the governor: wait, send, learn from the response"""
+        self.acquire(url, weight=weight, priority=priority, timeout=wait_timeout)
+        response = session.request(method, url, **kwargs)
+        self.observe(url, response)
+        return response
+
+    def stats(self) -> Dict:
+        with self._cond:
+            now = time.monotonic()
+            return {
+                name: {
+                    **bucket.metrics,
+                    "tokens": round(bucket.tokens, 2),
+                    "queued": len(bucket.waiters),
+                    "used_weight": bucket.used_weight,
+                    "paused_for": round(max(0.0, bucket.blocked_until - now), 1)
+                }
+                for name, bucket in self._buckets.items()
+            }
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide governor shared by every API client"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+        return _rate_limiter
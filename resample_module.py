@@ -0,0 +1,85 @@
+"""Array-based OHLCV resampling - real downsampling (aggregation) and interpolated upsampling"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def downsample_ohlcv(df: pd.DataFrame, minutes: int, drop_leading_partial: bool = True) -> pd.DataFrame:
+    """Aggregate candles into `minutes`-long buckets aligned to the epoch (as Binance does).
+
+    Open is the first open, High the max, Low the min, Close the last close and Volume the sum
+    of each bucket. The trailing bucket is kept even when incomplete - like a live kline it is the
+    candle still forming. A leading bucket that starts mid-way is dropped by default.
+    """
+    if df.empty:
+        return df[OHLCV_COLUMNS].copy()
+
+    open_ms = (df.index - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+    bucket_ms = int(minutes) * 60 * 1000
+    buckets = np.asarray(open_ms) // bucket_ms
+
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.concatenate((starts[1:], [len(buckets)])) - 1
+
+    result = pd.DataFrame({
+        "Open": df["Open"].to_numpy(dtype=float)[starts],
+        "High": np.maximum.reduceat(df["High"].to_numpy(dtype=float), starts),
+        "Low": np.minimum.reduceat(df["Low"].to_numpy(dtype=float), starts),
+        "Close": df["Close"].to_numpy(dtype=float)[ends],
+        "Volume": np.add.reduceat(df["Volume"].to_numpy(dtype=float), starts)
+    }, index=pd.to_datetime(buckets[starts] * bucket_ms, unit="ms"))
+    result.index.name = "Open Time"
+
+    if drop_leading_partial and open_ms[0] % bucket_ms != 0:
+        result = result.iloc[1:]
+    return result
+
+
+def upsample_ohlcv(df: pd.DataFrame, steps: int, rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+    """Insert `steps - 1` interpolated candles between every pair of candles.
+
+    High/Low/Close are linearly interpolated towards the next candle, each synthetic candle opens
+    at the previous close, and synthetic volume is the source volume with +/-30% jitter.
+    """
+    steps = int(steps)
+    if steps < 2 or len(df) < 2:
+        return df[OHLCV_COLUMNS].copy()
+    rng = rng if rng is not None else np.random.default_rng()
+
+    ratio = np.arange(steps) / steps  # Row 0 of every group is the original candle
+
+    def interpolate(values):
+        return (values[:-1, None] + ratio * (values[1:] - values[:-1])[:, None]).ravel()
+
+    high = interpolate(df["High"].to_numpy(dtype=float))
+    low = interpolate(df["Low"].to_numpy(dtype=float))
+    close = interpolate(df["Close"].to_numpy(dtype=float))
+    open_ = np.concatenate(([df["Open"].iat[0]], close[:-1]))
+    original = np.zeros(len(close), dtype=bool)
+    original[::steps] = True
+    open_[original] = df["Open"].to_numpy(dtype=float)[:-1]
+
+    # Keep synthetic candles well-formed
+    high = np.where(original, high, np.maximum(high, np.maximum(open_, close)))
+    low = np.where(original, low, np.minimum(low, np.minimum(open_, close)))
+
+    volume = np.repeat(df["Volume"].to_numpy(dtype=float)[:-1], steps)
+    volume = np.where(original, volume, volume * rng.uniform(0.7, 1.3, len(volume)))
+
+    times = df.index.values
+    offsets = (np.diff(times).astype(np.int64)[:, None] * ratio).astype(np.int64).ravel()
+    index = pd.DatetimeIndex(np.repeat(times[:-1], steps) + offsets.astype(np.diff(times).dtype))
+
+    last = df.iloc[-1]
+    result = pd.DataFrame({
+        "Open": np.append(open_, last["Open"]),
+        "High": np.append(high, last["High"]),
+        "Low": np.append(low, last["Low"]),
+        "Close": np.append(close, last["Close"]),
+        "Volume": np.append(volume, last["Volume"])
+    }, index=index.append(df.index[-1:]))
+    result.index.name = "Open Time"
+    return result
@@ -0,0 +1,99 @@
+"""Vectorized return/risk metrics - one NumPy pass over a price series or a batch of them"""
+import warnings
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, list]
+
+
+def risk_metrics(prices: ArrayLike, periods_per_year: float = 365, years: Optional[ArrayLike] = None,
+                 risk_free_rate: float = 0.02, var_level: float = 0.95) -> Dict:
+    """Return and risk metrics for one price series (1-D) or one series per row (2-D).
+
+    Rows of a batch may have different lengths: pad the front with NaN. `years` is the span
+    used to annualize each row's return (defaults to the number of returns / periods_per_year).
+    All values are fractions, not percentages:
+
+    total_return, annualized_return, volatility (annualized), sharpe_ratio, sortino_ratio,
+    max_drawdown, max_drawdown_duration (longest stretch below a previous peak, in periods),
+    calmar_ratio, var and cvar (historical, per period, as positive losses at var_level).
+    """
+    p = np.asarray(prices, dtype=float)
+    single = p.ndim == 1
+    p = np.atleast_2d(p)
+    rows, n = p.shape
+    row_index = np.arange(rows)
+
+    valid = ~np.isnan(p)
+    count = valid.sum(axis=1)
+    first = p[row_index, np.argmax(valid, axis=1)]
+    last = p[row_index, n - 1 - np.argmax(valid[:, ::-1], axis=1)]
+
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # All-NaN rows are masked out below
+        returns = np.diff(np.log(p), axis=1)
+        observed = ~np.isnan(returns)
+        n_returns = observed.sum(axis=1)
+
+        growth = last / first
+        total_return = growth - 1
+        if years is None:
+            years = n_returns / periods_per_year
+        annualized_return = growth ** (1 / np.asarray(years, dtype=float)) - 1
+
+        zeroed = np.where(observed, returns, 0.0)
+        mean = zeroed.sum(axis=1) / n_returns
+        variance = (np.where(observed, returns - mean[:, None], 0.0) ** 2).sum(axis=1) / n_returns
+        volatility = np.sqrt(variance * periods_per_year)
+        downside = np.sqrt((np.minimum(zeroed, 0.0) ** 2).sum(axis=1) / n_returns * periods_per_year)
+
+        excess = annualized_return - risk_free_rate
+        sharpe_ratio = np.where(volatility > 0, excess / volatility, 0.0)
+        sortino_ratio = np.where(downside > 0, excess / downside, 0.0)
+
+        # Running peak ignores the NaN padding; drawdown is NaN there and never counts as underwater
+        peak = np.fmax.accumulate(p, axis=1)
+        drawdown = 1 - p / peak
+        max_drawdown = np.nanmax(np.where(valid, drawdown, 0.0), axis=1)
+        underwater = drawdown > 0
+        positions = np.arange(n)
+        last_peak = np.maximum.accumulate(np.where(underwater, 0, positions), axis=1)
+        max_drawdown_duration = np.where(underwater, positions - last_peak, 0).max(axis=1)
+        calmar_ratio = np.where(max_drawdown > 0, annualized_return / max_drawdown, 0.0)
+
+        # Historical VaR/CVaR - linear-interpolated quantile of each row's observed returns
+        ordered = np.sort(np.where(observed, returns, np.inf), axis=1)
+        position = (1 - var_level) * np.maximum(n_returns - 1, 0)
+        low = np.floor(position).astype(int)
+        high = np.minimum(low + 1, np.maximum(n_returns - 1, 0))
+        if ordered.shape[1]:
+            cutoff = ordered[row_index, low] + (ordered[row_index, high] - ordered[row_index, low]) * (position - low)
+        else:
+            cutoff = np.full(rows, np.nan)
+        tail = observed & (returns <= cutoff[:, None])
+        var = -cutoff
+        cvar = -np.where(tail, returns, 0.0).sum(axis=1) / tail.sum(axis=1)
+
+    metrics = {
+        "total_return": total_return,
+        "annualized_return": annualized_return,
+        "volatility": volatility,
+        "sharpe_ratio": sharpe_ratio,
+        "sortino_ratio": sortino_ratio,
+        "max_drawdown": max_drawdown,
+        "max_drawdown_duration": max_drawdown_duration,
+        "calmar_ratio": calmar_ratio,
+        "var": var,
+        "cvar": cvar
+    }
+
+    # Rows with fewer than two prices have no returns to measure
+    too_short = count < 2
+    if too_short.any():
+        for name in metrics:
+            metrics[name] = np.where(too_short, np.nan, metrics[name])
+
+    if single:
+        return {name: value[0].item() for name, value in metrics.items()}
+    return metrics
@@ -0,0 +1,61 @@
+"""Single-flight request coalescing - concurrent identical calls share one in-flight execution"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Runs fn once per key at a time; callers arriving while it runs wait for the same result.
+
+    The first caller (the leader) executes fn in its own thread. Everyone else blocks on the
+    leader's future and receives the same return value or exception. Nothing is cached: once
+    the call finishes, the next caller starts a fresh one. Shared results are the same object -
+    copy them before mutating.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.metrics = {"calls": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.metrics["calls"] += 1
+            else:
+                self.metrics["shared"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.metrics, "in_flight": len(self._calls)}
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide group, so identical work from different Streamlit sessions is coalesced"""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
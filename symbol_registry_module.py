@@ -0,0 +1,204 @@
+"""Unified symbol registry - Binance symbols, CoinGecko IDs and aliases behind one Aho-Corasick matcher"""
+import threading
+from collections import deque, namedtuple
+from typing import Dict, List, Optional
+
+Asset = namedtuple("Asset", ["binance", "coingecko", "aliases"])
+
+# (Binance symbol or None, CoinGecko id, aliases) - aliases are matched as whole words, case-insensitively
+ASSETS = [
+    # Majors
+    ("BTCUSDT", "bitcoin", ("btc", "bitcoin", "xbt")),
+    ("ETHUSDT", "ethereum", ("eth", "ethereum")),
+    ("BNBUSDT", "binancecoin", ("bnb", "binance")),
+    ("XRPUSDT", "ripple", ("xrp", "ripple")),
+    ("LTCUSDT", "litecoin", ("ltc", "litecoin")),
+    ("BCHUSDT", "bitcoin-cash", ("bch", "bitcoin cash")),
+    # Layer 1s
+    ("SOLUSDT", "solana", ("sol", "solana")),
+    ("ADAUSDT", "cardano", ("ada", "cardano")),
+    ("AVAXUSDT", "avalanche-2", ("avax", "avalanche")),
+    ("DOTUSDT", "polkadot", ("dot", "polkadot")),
+    ("ATOMUSDT", "cosmos", ("atom", "cosmos")),
+    ("NEARUSDT", "near", ("near", "near protocol")),
+    ("ALGOUSDT", "algorand", ("algo", "algorand")),
+    ("APTUSDT", "aptos", ("apt", "aptos")),
+    ("SUIUSDT", "sui", ("sui", "sui network")),
+    ("TONUSDT", "the-open-network", ("ton", "toncoin")),
+    ("TRXUSDT", "tron", ("trx", "tron")),
+    ("ICPUSDT", "internet-computer", ("icp", "internet computer")),
+    ("HBARUSDT", "hedera-hashgraph", ("hbar", "hedera")),
+    ("VETUSDT", "vechain", ("vet", "vechain")),
+    ("KASUSDT", "kaspa", ("kas", "kaspa")),
+    ("INJUSDT", "injective-protocol", ("inj", "injective")),
+    ("SEIUSDT", "sei-network", ("sei",)),
+    ("TIAUSDT", "celestia", ("tia", "celestia")),
+    # Layer 2s / Scaling
+    ("MATICUSDT", "matic-network", ("matic", "polygon")),
+    ("POLUSDT", "polygon-ecosystem-token", ("pol",)),
+    ("OPUSDT", "optimism", ("op", "optimism")),
+    ("ARBUSDT", "arbitrum", ("arb", "arbitrum")),
+    ("IMXUSDT", "immutable-x", ("imx", "immutable")),
+    # Meme coins
+    ("DOGEUSDT", "dogecoin", ("doge", "dogecoin")),
+    ("SHIBUSDT", "shiba-inu", ("shib", "shiba", "shiba inu")),
+    ("PEPEUSDT", "pepe", ("pepe", "pepe coin")),
+    ("FLOKIUSDT", "floki", ("floki", "floki inu")),
+    # Stablecoins
+    ("USDTUSDT", "tether", ("usdt", "tether")),
+    ("USDCUSDT", "usd-coin", ("usdc", "usd coin")),
+    ("DAIUSDT", "dai", ("dai",)),
+    ("BUSDUSDT", "binance-usd", ("busd", "binance usd")),
+    ("TUSDUSDT", "true-usd", ("tusd", "trueusd")),
+    # DeFi, gaming and infrastructure
+    ("LINKUSDT", "chainlink", ("link", "chainlink")),
+    ("UNIUSDT", "uniswap", ("uni", "uniswap")),
+    ("AAVEUSDT", "aave", ("aave",)),
+    ("COMPUSDT", "compound-governance-token", ("comp", "compound")),
+    ("SANDUSDT", "the-sandbox", ("sand", "sandbox")),
+    ("MANAUSDT", "decentraland", ("mana", "decentraland")),
+    ("AXSUSDT", "axie-infinity", ("axs", "axie")),
+    ("RNDRUSDT", "render-token", ("rndr", "render")),
+    ("GALAUSDT", "gala", ("gala",)),
+    ("FILUSDT", "filecoin", ("fil", "filecoin")),
+    ("GRTUSDT", "the-graph", ("grt", "the graph")),
+    ("RUNEUSDT", "thorchain", ("rune", "thorchain")),
+    # Wrapped / staked (no Binance USDT pair)
+    (None, "wrapped-bitcoin", ("wbtc", "wrapped bitcoin")),
+    (None, "staked-ether", ("steth",)),
+    (None, "leo-token", ("leo",)),
+]
+
+# Timeframe aliases share the same automaton, so one pass extracts both
+TIMEFRAME_ALIASES = {
+    "1m": ("1m", "1 minute", "1min"),
+    "5m": ("5m", "5 minute", "5min"),
+    "15m": ("15m", "15 minute", "15min"),
+    "1h": ("1h", "1 hour", "1hr", "hourly"),
+    "4h": ("4h", "4 hour", "4hr"),
+    "1d": ("1d", "daily", "day"),
+}
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher - one linear pass over the text finds every pattern occurrence"""
+
+    def __init__(self, patterns: Dict[str, object]):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                if ch not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.output[node].append((len(pattern), value))
+
+        # Breadth-first failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def iter(self, text: str):
+        """Yield (start, end, value) for every occurrence, end exclusive"""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, value in self.output[node]:
+                yield i + 1 - length, i + 1, value
+
+
+class SymbolRegistry:
+    """Resolves free text, tickers, Binance symbols and CoinGecko IDs to one Asset record"""
+
+    def __init__(self, assets=ASSETS, timeframes=TIMEFRAME_ALIASES):
+        self.assets = [Asset(binance, coingecko, tuple(aliases)) for binance, coingecko, aliases in assets]
+        self.by_binance = {asset.binance: asset for asset in self.assets if asset.binance}
+        self.by_coingecko = {asset.coingecko: asset for asset in self.assets}
+
+        patterns = {}
+        for asset in self.assets:
+            for alias in asset.aliases:
+                patterns[alias.lower()] = ("asset", asset)
+        for interval, aliases in timeframes.items():
+            for alias in aliases:
+                patterns[alias.lower()] = ("interval", interval)
+        self.aliases = patterns
+        self.matcher = AhoCorasick(patterns)
+
+    def extract(self, text: str) -> List[tuple]:
+        """Whole-word entity mentions in text as (start, kind, value), leftmost-longest and non-overlapping"""
+        text = text.lower()
+        matches = []
+        for start, end, (kind, value) in self.matcher.iter(text):
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalnum():
+                continue
+            matches.append((start, end, kind, value))
+
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        entities, covered = [], -1
+        for start, end, kind, value in matches:
+            if start >= covered:
+                entities.append((start, kind, value))
+                covered = end
+        return entities
+
+    def resolve(self, text: str) -> Optional[Asset]:
+        """First asset mentioned in text"""
+        for _, kind, value in self.extract(text):
+            if kind == "asset":
+                return value
+        return None
+
+    def resolve_interval(self, text: str) -> Optional[str]:
+        """First timeframe mentioned in text"""
+        for _, kind, value in self.extract(text):
+            if kind == "interval":
+                return value
+        return None
+
+    def lookup(self, key: str) -> Optional[Asset]:
+        """Asset for an exact Binance symbol, CoinGecko ID or alias"""
+        key = key.strip()
+        asset = self.by_binance.get(key.upper()) or self.by_coingecko.get(key.lower())
+        if asset is None:
+            kind, value = self.aliases.get(key.lower(), (None, None))
+            asset = value if kind == "asset" else None
+        return asset
+
+    def coingecko_id(self, key: str) -> Optional[str]:
+        asset = self.lookup(key)
+        return asset.coingecko if asset else None
+
+    def binance_symbol(self, key: str) -> Optional[str]:
+        asset = self.lookup(key)
+        return asset.binance if asset else None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_symbol_registry() -> SymbolRegistry:
+    """Process-wide registry, built once"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SymbolRegistry()
+        return _registry
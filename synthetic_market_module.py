@@ -0,0 +1,90 @@
+"""Vectorized synthetic OHLCV market generator for demos, fallbacks and load tests"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Market regimes: (name, drift per bar in units of the base volatility, volatility multiplier)
+REGIMES = (
+    ("Bull", 0.05, 0.9),
+    ("Bear", -0.05, 1.3),
+    ("Range", 0.0, 0.7)
+)
+
+DAILY_VOLATILITY = 0.03
+
+
+def interval_volatility(minutes: float, daily_volatility: float = DAILY_VOLATILITY) -> float:
+    """Per-bar volatility for a candle length, scaled with the square root of time"""
+    return daily_volatility * np.sqrt(minutes / 1440)
+
+
+def _regime_path(rng: np.random.Generator, n: int, mean_length: float) -> np.ndarray:
+    """Markov regime path built from geometric run lengths (no per-bar loop)"""
+    runs = rng.geometric(1 / mean_length, size=int(n / mean_length) + 16)
+    while runs.sum() < n:
+        runs = np.concatenate((runs, rng.geometric(1 / mean_length, size=len(runs))))
+    labels = rng.integers(0, len(REGIMES), size=len(runs))
+    return np.repeat(labels, runs)[:n]
+
+
+def _clustered_log_vol(rng: np.random.Generator, n: int, persistence: float, vol_of_vol: float) -> np.ndarray:
+    """Stationary AR(1) log-volatility, evaluated with pandas' compiled ewm recursion"""
+    shocks = rng.standard_normal(n)
+    shocks[0] *= np.sqrt((1 - persistence) / (1 + persistence))  # Start from the stationary distribution
+    ar = pd.Series(shocks).ewm(alpha=1 - persistence, adjust=False).mean().to_numpy()
+    return ar * vol_of_vol * np.sqrt((1 + persistence) / (1 - persistence))
+
+
+def generate_synthetic_ohlcv(limit: int, base_price: float = 1.0, minutes: int = 15,
+                             end_time: Optional[datetime] = None, seed: Optional[int] = None,
+                             rng: Optional[np.random.Generator] = None, volatility: float = 0.01,
+                             regime_switching: bool = True, mean_regime_length: float = 250,
+                             vol_clustering: bool = True, vol_persistence: float = 0.98,
+                             vol_of_vol: float = 0.35, base_volume: float = 200000,
+                             volume_beta: float = 0.6, include_regime: bool = False) -> pd.DataFrame:
+    """Geometric Brownian motion candles with optional regime switching, volatility clustering
+    and volume correlated with the size of each move.
+
+    Everything is drawn from a local numpy Generator (`rng`, or one seeded with `seed`),
+    so the global numpy/random state is never touched.
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    n = int(limit)
+    timestamps = pd.date_range(end=end_time or datetime.now(), periods=max(n, 0), freq=f"{minutes}min", name="Open Time")
+    if n <= 0:
+        return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"], index=timestamps, dtype=float)
+
+    # Per-bar drift and volatility
+    if regime_switching:
+        regime = _regime_path(rng, n, mean_regime_length)
+        drift = volatility * np.array([r[1] for r in REGIMES])[regime]
+        sigma = volatility * np.array([r[2] for r in REGIMES])[regime]
+    else:
+        regime = None
+        drift = np.zeros(n)
+        sigma = np.full(n, float(volatility))
+    if vol_clustering:
+        sigma = sigma * np.exp(_clustered_log_vol(rng, n, vol_persistence, vol_of_vol) - 0.5 * vol_of_vol ** 2)
+
+    # GBM closes, first candle opens and closes at the base price
+    z = rng.standard_normal(n)
+    log_returns = drift - 0.5 * sigma ** 2 + sigma * z
+    log_returns[0] = 0.0
+    close = base_price * np.exp(np.cumsum(log_returns))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+
+    # Wicks scale with the bar's volatility
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.standard_normal(n)) * sigma)
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.standard_normal(n)) * sigma)
+
+    # Volume rises with the size of the move and the volatility regime
+    log_volume = (np.log(base_volume) + volume_beta * (np.abs(z) - np.sqrt(2 / np.pi))
+                  + 0.5 * np.log(sigma / volatility) + 0.3 * rng.standard_normal(n))
+    volume = np.exp(log_volume)
+
+    df = pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=timestamps)
+    if include_regime and regime is not None:
+        df["Regime"] = np.array([r[0] for r in REGIMES])[regime]
+    return df
@@ -0,0 +1,38 @@
+"""Vectorized confluence engine against the row-by-row analyze_* path"""
+import pytest
+
+import betterpredictormodule
+from betterpredictormodule import STRENGTH_WEIGHTS
+from candle_store_module import CandleStore
+
+SIDES = ("bullish", "bearish", "neutral")
+
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    return betterpredictormodule.TradingAnalyzer(candle_store=CandleStore(str(tmp_path_factory.mktemp("store") / "candles.db")))
+
+
+@pytest.mark.parametrize("symbol, interval", [("BTCUSDT", "15m"), ("DOGEUSDT", "1h")])
+def test_confluence_scores_match_row_by_row_analysis(analyzer, symbol, interval):
+    df = analyzer.add_comprehensive_indicators(analyzer._generate_synthetic_data(symbol, interval, 1500, seed=5))
+    scores = analyzer.compute_confluence_scores(df)
+
+    assert list(scores.index) == list(df.index)
+    for i in range(len(df)):
+        confluences, _ = analyzer.generate_comprehensive_analysis(df.iloc[:i + 1])
+        bias, strength = analyzer.calculate_confluence_strength(confluences)
+        row = scores.iloc[i]
+
+        for side in SIDES:
+            name = side.capitalize()
+            assert row[f"{name}_Score"] == sum(STRENGTH_WEIGHTS[c["strength"]] for c in confluences[side])
+            assert row[f"{name}_Count"] == len(confluences[side])
+        assert row["Bias"] == bias
+        assert row["Bias_Strength"] == pytest.approx(strength, abs=1e-9)
+
+
+def test_every_bias_is_exercised(analyzer):
+    df = analyzer.add_comprehensive_indicators(analyzer._generate_synthetic_data("BTCUSDT", "15m", 1500, seed=5))
+    biases = set(analyzer.compute_confluence_scores(df)["Bias"])
+    assert {"Bullish Bias", "Bearish Bias", "Mixed/Neutral"} <= biases
@@ -0,0 +1,53 @@
+"""IndicatorState against add_comprehensive_indicators (the ta library) on a seeded series"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import betterpredictormodule
+from candle_store_module import CandleStore
+from indicator_state_module import IndicatorState
+
+
+@pytest.fixture(scope="module")
+def analyzer(tmp_path_factory):
+    return betterpredictormodule.TradingAnalyzer(candle_store=CandleStore(str(tmp_path_factory.mktemp("store") / "candles.db")))
+
+
+@pytest.fixture(scope="module", params=[("BTCUSDT", "1m"), ("DOGEUSDT", "15m")])
+def candles(request, analyzer):
+    symbol, interval = request.param
+    return analyzer._generate_synthetic_data(symbol, interval, 2000, seed=11)
+
+
+def candle_dicts(df):
+    for open_time, row in df.iterrows():
+        yield {"Open Time": open_time, **row.to_dict()}
+
+
+def test_streamed_rows_match_batch_indicators(analyzer, candles):
+    reference = analyzer.add_comprehensive_indicators(candles.copy())
+    state = IndicatorState()
+    rows = [state.update(candle) for candle in candle_dicts(candles)]
+    streamed = pd.DataFrame(rows).set_index("Open Time")
+
+    # add_comprehensive_indicators drops the warm-up rows; every surviving row must match
+    streamed = streamed.loc[reference.index, reference.columns]
+    for column in reference.columns:
+        np.testing.assert_allclose(streamed[column], reference[column], rtol=1e-6, atol=1e-9, err_msg=column)
+    assert state.ready
+
+
+def test_preview_matches_update_without_touching_state(candles):
+    state = IndicatorState.from_frame(candles.iloc[:-1])
+    latest = state.latest
+    forming = next(candle_dicts(candles.iloc[-1:]))
+
+    previewed = state.preview(forming)
+    assert state.latest is latest
+    assert state.preview(forming) == previewed  # Repeatable, so nothing leaked into the state
+    assert state.update(forming) == previewed
+
+
+def test_warm_up_rows_are_not_ready(candles):
+    state = IndicatorState.from_frame(candles.iloc[:IndicatorState.WARMUP_BARS - 1])
+    assert not state.ready
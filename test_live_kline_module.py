@@ -0,0 +1,194 @@
+"""LiveKlineFeed against a local websocket stand-in server that replays recorded klines"""
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("websocket")
+
+import betterpredictormodule
+from candle_store_module import CandleStore
+from live_kline_module import LiveKlineFeed
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+SYMBOL = "BTCUSDT"
+INTERVAL = "1m"
+
+
+def record_klines(df, interval=INTERVAL):
+    """Binance kline stream payloads for each candle: one forming update, then the close"""
+    messages = []
+    step = pd.Timedelta(minutes=betterpredictormodule.INTERVAL_MINUTES[interval])
+    for ts, row in df.iterrows():
+        open_ms = int(ts.value // 10**6)
+        close_ms = int((ts + step).value // 10**6) - 1
+        for fraction, closed in ((0.5, False), (1.0, True)):
+            messages.append(json.dumps({
+                "e": "kline", "E": close_ms, "s": SYMBOL,
+                "k": {
+                    "t": open_ms, "T": close_ms, "s": SYMBOL, "i": interval,
+                    "o": str(row.Open), "h": str(row.High), "l": str(row.Low),
+                    "c": str(row.Close * fraction + row.Open * (1 - fraction)),
+                    "v": str(row.Volume * fraction), "n": 100, "x": closed
+                }
+            }))
+    return messages
+
+
+class KlineReplayServer:
+    """Minimal RFC 6455 server: each accepted connection replays the next recorded session.
+
+    A session ending with drop=True closes the TCP connection without a close frame, like a
+    network outage; otherwise the connection stays open until the client hangs up.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        self.paths = []
+        self._sock = socket.socket()
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.url = f"ws://127.0.0.1:{self._sock.getsockname()[1]}"
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while self.sessions:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            messages, drop = self.sessions.pop(0)
+            threading.Thread(target=self._replay, args=(conn, messages, drop), daemon=True).start()
+
+    def _replay(self, conn, messages, drop):
+        with conn:
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += conn.recv(4096)
+            lines = request.decode().split("\r\n")
+            self.paths.append(lines[0].split()[1])
+            headers = dict(line.split(": ", 1) for line in lines[1:] if ": " in line)
+            accept = base64.b64encode(hashlib.sha1((headers["Sec-WebSocket-Key"] + WS_GUID).encode()).digest())
+            conn.sendall(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                         b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            for message in messages:
+                conn.sendall(self._frame(message.encode()))
+            if drop:
+                conn.shutdown(socket.SHUT_RDWR)
+                return
+            # Answer the client's close frame so it can hang up without waiting out its timeout
+            try:
+                while True:
+                    data = conn.recv(4096)
+                    if not data or data[0] & 0x0F == 0x8:
+                        conn.sendall(self._frame(b"", opcode=0x8))
+                        return
+            except OSError:
+                pass
+
+    @staticmethod
+    def _frame(payload, opcode=0x1):
+        if len(payload) < 126:
+            header = struct.pack("!BB", 0x80 | opcode, len(payload))
+        elif len(payload) < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, len(payload))
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, len(payload))
+        return header + payload
+
+    def close(self):
+        self.sessions = []
+        self._sock.close()
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return betterpredictormodule.TradingAnalyzer(candle_store=CandleStore(str(tmp_path / "candles.db")))
+
+
+@pytest.fixture
+def candles(analyzer):
+    df = analyzer._generate_synthetic_data(SYMBOL, INTERVAL, 800, seed=7)
+    df.index = pd.date_range("2024-01-01", periods=len(df), freq="1min")
+    return df
+
+
+def wait_for(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the kline stream")
+        time.sleep(0.05)
+
+
+def assert_matches_batch(feed, analyzer, df):
+    """The live snapshot equals a full add_comprehensive_indicators + generate_comprehensive_analysis pass"""
+    reference = analyzer.add_comprehensive_indicators(df.copy())
+    confluences, latest = analyzer.generate_comprehensive_analysis(reference)
+    bias, strength = analyzer.calculate_confluence_strength(confluences)
+
+    snapshot = feed.snapshot()
+    assert snapshot["bias"] == bias
+    assert snapshot["strength"] == pytest.approx(strength)
+    for side in ("bullish", "bearish", "neutral"):
+        assert [c["indicator"] for c in snapshot["confluences"][side]] == [c["indicator"] for c in confluences[side]]
+    live = snapshot["latest"][reference.columns].astype(float)
+    pd.testing.assert_series_equal(live, latest.astype(float), check_names=False, rtol=1e-6)
+
+    assert list(feed.frame().index) == list(df.index)
+
+
+def test_replayed_klines_match_batch_analysis(analyzer, candles):
+    server = KlineReplayServer([(record_klines(candles.iloc[599:]), False)])
+    feed = LiveKlineFeed(analyzer, SYMBOL, INTERVAL, ws_url=server.url)
+    feed.warm_up(candles.iloc[:600])
+    try:
+        feed.start(warm_up=False)
+        wait_for(lambda: feed.messages == 2 * 201)
+    finally:
+        feed.stop()
+        server.close()
+
+    assert server.paths == ["/btcusdt@kline_1m"]
+    assert_matches_batch(feed, analyzer, candles)
+
+
+def test_reconnect_backfills_candles_missed_during_outage(analyzer, candles):
+    # The stream drops after candle 649; by the time it is back, REST already has up to candle 700
+    server = KlineReplayServer([
+        (record_klines(candles.iloc[599:650]), True),
+        (record_klines(candles.iloc[700:]), False),
+    ])
+    analyzer.fetch_exchange_ohlcv = lambda symbol, interval, limit: candles.iloc[:701].tail(limit)
+    feed = LiveKlineFeed(analyzer, SYMBOL, INTERVAL, ws_url=server.url)
+    feed.warm_up(candles.iloc[:600])
+    try:
+        feed.start(warm_up=False)
+        wait_for(lambda: feed.messages == 2 * (51 + 100))
+    finally:
+        feed.stop()
+        server.close()
+
+    assert len(server.paths) == 2
+    # The state was re-seeded from the 500 REST candles ending at candle 700
+    assert_matches_batch(feed, analyzer, candles.iloc[201:])
+
+
+def test_warm_up_refuses_fallback_candles(analyzer):
+    async def mirrors_down(*args, **kwargs):
+        raise betterpredictormodule.MirrorRaceError("All Binance mirrors failed: offline")
+
+    analyzer._race_binance_mirrors = mirrors_down
+    feed = LiveKlineFeed(analyzer, SYMBOL, INTERVAL)
+    with pytest.raises(betterpredictormodule.MirrorRaceError):
+        feed.warm_up()
+    assert feed.snapshot() is None
+    assert feed.frame().empty
@@ -0,0 +1,142 @@
+"""stream_chat / complete_chat against a local SSE stand-in server"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm_stream_module import complete_chat, iter_sse_data, stream_chat
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def delta(content):
+    return "data: " + json.dumps({"choices": [{"index": 0, "delta": {"content": content}}]}) + "\n\n"
+
+
+class SSEStandIn:
+    """Chunked text/event-stream server that writes each scripted chunk as it is reached.
+
+    A threading.Event in the script pauses the response until the test sets it, which lets a
+    test prove a token arrived before the rest of the stream was even written.
+    """
+
+    def __init__(self, script, status=200):
+        self.script = script
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                stand_in.requests.append((dict(self.headers), json.loads(body)))
+                self.send_response(status)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for item in stand_in.script:
+                        if isinstance(item, threading.Event):
+                            item.wait(10)
+                            continue
+                        chunk = item.encode()
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client stopped reading early (e.g. after [DONE])
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v1/chat/completions"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(script, status=200):
+        server = SSEStandIn(script, status)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_token_deltas_are_yielded_in_order(stand_in):
+    server = stand_in([delta("Hel"), delta("lo"), delta(" world"), "data: [DONE]\n\n"])
+    tokens = list(stream_chat(MESSAGES, "test/model", "key", max_tokens=50, url=server.url))
+
+    assert tokens == ["Hel", "lo", " world"]
+    headers, payload = server.requests[0]
+    assert headers["Authorization"] == "Bearer key"
+    assert headers["Accept"] == "text/event-stream"
+    assert payload == {"model": "test/model", "messages": MESSAGES, "stream": True, "max_tokens": 50}
+
+
+def test_first_token_arrives_before_the_stream_ends(stand_in):
+    release = threading.Event()
+    server = stand_in([delta("first"), release, delta("second"), "data: [DONE]\n\n"])
+    stream = stream_chat(MESSAGES, "test/model", "key", url=server.url)
+
+    assert next(stream) == "first"  # The server is still holding back the rest
+    release.set()
+    assert list(stream) == ["second"]
+
+
+def test_comment_lines_and_empty_deltas_are_skipped(stand_in):
+    server = stand_in([
+        ": OPENROUTER PROCESSING\n\n",
+        delta("a"),
+        ": keep-alive\n\n",
+        "data: " + json.dumps({"choices": [{"delta": {"role": "assistant"}}]}) + "\n\n",
+        delta(""),
+        delta("b"),
+        "data: [DONE]\n\n",
+    ])
+    assert complete_chat(MESSAGES, "test/model", "key", url=server.url) == "ab"
+
+
+def test_done_stops_reading(stand_in):
+    server = stand_in([delta("kept"), "data: [DONE]\n\n", delta("ignored")])
+    assert complete_chat(MESSAGES, "test/model", "key", url=server.url) == "kept"
+
+
+def test_events_split_across_chunks_are_reassembled(stand_in):
+    event = delta("split")
+    server = stand_in([event[:10], event[10:25], event[25:], "data: [DONE]\n\n"])
+    assert complete_chat(MESSAGES, "test/model", "key", url=server.url) == "split"
+
+
+def test_error_event_raises_with_its_message(stand_in):
+    server = stand_in([
+        delta("partial"),
+        "data: " + json.dumps({"error": {"code": 502, "message": "Provider returned error"}}) + "\n\n",
+    ])
+    stream = stream_chat(MESSAGES, "test/model", "key", url=server.url)
+
+    assert next(stream) == "partial"
+    with pytest.raises(Exception, match="Provider returned error"):
+        next(stream)
+
+
+def test_http_error_status_raises(stand_in):
+    server = stand_in(['{"error": {"message": "No auth credentials found"}}'], status=401)
+    with pytest.raises(Exception, match="401"):
+        complete_chat(MESSAGES, "test/model", "key", url=server.url)
+
+
+def test_iter_sse_data_joins_multiline_data_fields():
+    lines = ["event: message", "data: line one", "data:line two", "id: 7", "", ": comment", "data: next", ""]
+    assert list(iter_sse_data(lines)) == ["line one\nline two", "next"]
@@ -0,0 +1,73 @@
+"""Screener routing and query parsing - which chat messages become a market screen"""
+import pytest
+
+from token_screener_module import TokenScreener, build_screener_frame, is_screen_query, parse_screen_query
+
+
+@pytest.mark.parametrize("text", [
+    "show me low-risk mid caps with good liquidity",
+    "Screen for low-risk mid caps",
+    "screener: high risk small caps",
+    "find high risk small caps",
+    "list large caps",
+    "which tokens are liquid small caps",
+    "show me the top 10 safe coins",
+    "give me some liquid tokens",
+    "find me risky micro cap coins",
+])
+def test_screen_requests_are_routed_to_the_screener(text):
+    assert is_screen_query(text)
+
+
+@pytest.mark.parametrize("text", [
+    "Where can I find a safe wallet for my bitcoin?",
+    "Can you list what affects liquidity?",
+    "What are the top risks of small caps?",
+    "is bitcoin safe? find out",
+    "here's a screenshot of my chart, thoughts?",
+    "is it listed on binance? low risk?",
+    "top 5 reasons to buy btc",
+    "screen coins",
+    "show me the tokenomics of solana",
+    "which coins should I buy?",
+])
+def test_ordinary_chat_is_not_routed_to_the_screener(text):
+    assert not is_screen_query(text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("show me low-risk mid caps with good liquidity",
+     {"categories": ["Mid Cap"], "max_risk": 19, "min_volume_to_mcap": 2}),
+    ("find high risk small caps", {"categories": ["Small Cap"], "min_risk": 40}),
+    ("list moderate risk large caps and mid caps", {"categories": ["Large Cap", "Mid Cap"], "min_risk": 20, "max_risk": 39}),
+    ("show me the top 10 safe coins", {"max_risk": 19, "limit": 10}),
+    ("low fdv tokens with high volume", {"min_volume_to_mcap": 2, "max_fdv_ratio": 1.2}),
+    ("Where can I find a safe wallet for my bitcoin?", {}),
+    ("Can you list what affects liquidity?", {}),
+])
+def test_parse_screen_query(text, expected):
+    assert parse_screen_query(text) == expected
+
+
+def coin(rank, market_cap, volume, total_supply, circulating_supply, price=1.0):
+    return {
+        "id": f"coin-{rank}", "symbol": f"c{rank}", "name": f"Coin {rank}", "market_cap_rank": rank,
+        "current_price": price, "market_cap": market_cap, "total_volume": volume,
+        "circulating_supply": circulating_supply, "total_supply": total_supply, "max_supply": None,
+        "sparkline_in_7d": {"price": [price * (1 + 0.001 * (i % 3)) for i in range(168)]},
+    }
+
+
+def test_screen_text_applies_parsed_filters():
+    coins = [
+        coin(1, 50e9, 5e9, 1e9, 1e9),       # Large cap, liquid, fully circulating
+        coin(2, 5e9, 10e6, 1e9, 3e8),       # Mid cap, illiquid, mostly locked
+        coin(3, 4e9, 200e6, 1e9, 9e8),      # Mid cap, liquid
+        coin(4, 20e6, 1e3, 1e9, 1e8),       # Nano cap, illiquid
+    ]
+    df = build_screener_frame(coins)
+    screener = TokenScreener(get_json=lambda *args, **kwargs: coins)
+
+    assert list(screener.screen(df=df, **parse_screen_query("show me low-risk mid caps"))["Id"]) == ["coin-3"]
+    assert list(screener.screen_text("find high risk nano caps")["Id"]) == ["coin-4"]
+    assert list(screener.screen(df=df, **parse_screen_query("list liquid tokens"))["Id"]) == ["coin-1", "coin-3"]
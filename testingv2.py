@@ -17,65 +17,25 @@ import time
 import base64
 from pathlib import Path
 import hashlib
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from user_store_module import get_user_store
+from rate_limit_module import get_rate_limiter
+from singleflight_module import get_single_flight
 
-USER_DATA_FILE = "user_data.json"
 FREE_USES_LIMIT = 3
 
-def load_user_data():
-    """Load user data from JSON file"""
-    if os.path.exists(USER_DATA_FILE):
-        try:
-            with open(USER_DATA_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {"users": {}}
-    return {"users": {}}
-
-def save_user_data(data):
-    """Save user data to JSON file"""
-    with open(USER_DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
 def get_user_by_email(email):
     """Get user by email"""
-    data = load_user_data()
-    return data["users"].get(email.lower())
+    return get_user_store().get_user(email)
 
 def create_user(name, email):
     """Create a new user"""
-    data = load_user_data()
-    email_lower = email.lower()
-    data["users"][email_lower] = {
-        "name": name,
-        "email": email_lower,
-        "created_at": datetime.now().isoformat(),
-        "total_uses": 0,
-        "features_used": {
-            "chat": 0,
-            "quick_analysis": 0,
-            "tokenomics": 0,
-            "prediction": 0,
-            "chart_analysis": 0,
-            "news": 0
-        },
-        "last_active": datetime.now().isoformat()
-    }
-    save_user_data(data)
-    return data["users"][email_lower]
+    return get_user_store().create_user(name, email)
 
 def update_user_usage(email, feature):
     """Update user's usage count for a feature"""
-    data = load_user_data()
-    email_lower = email.lower()
-    if email_lower in data["users"]:
-        data["users"][email_lower]["total_uses"] += 1
-        if feature in data["users"][email_lower]["features_used"]:
-            data["users"][email_lower]["features_used"][feature] += 1
-        else:
-            data["users"][email_lower]["features_used"][feature] = 1
-        data["users"][email_lower]["last_active"] = datetime.now().isoformat()
-        save_user_data(data)
+    get_user_store().record_usage(email, feature)
 
 def get_session_id():
     """Generate a unique session ID based on browser fingerprint"""
@@ -286,12 +246,52 @@ try:
 except Exception:
     betterpredictormodule = None
 
+# Symbol/alias registry shared by the prediction and tokenomics paths
+from symbol_registry_module import get_symbol_registry
+
+# Token-budgeted LLM context with a per-message render cache
+from conversation_context_module import get_context_builder
+
+# Vectorized return/drawdown metrics (single series or batches)
+from risk_metrics_module import risk_metrics
+
 try:
     from montecarlo_module import simulate_trades, monte_carlo_summary
 except Exception:
     simulate_trades = None
     monte_carlo_summary = None
 
+try:
+    from http_cache_module import coingecko_cache
+except Exception:
+    coingecko_cache = None
+
+try:
+    from coin_index_module import get_coin_index
+except Exception:
+    get_coin_index = None
+
+try:
+    from token_screener_module import TokenScreener, is_screen_query, DISPLAY_COLUMNS as SCREENER_COLUMNS
+except Exception:
+    TokenScreener = None
+
+try:
+    from live_kline_module import get_live_hub, websocket as live_websocket
+    if live_websocket is None:
+        get_live_hub = None
+except Exception:
+    get_live_hub = None
+
+# Streaming OpenRouter client - replies render token by token
+from llm_stream_module import stream_chat
+
+try:
+    from completion_cache_module import get_completion_cache
+    completion_cache = get_completion_cache()
+except Exception:
+    completion_cache = None
+
 # API keys (recommended to put into Streamlit secrets)
 try:
     AI_API_KEY = st.secrets.get("AI_API_KEY", "")
@@ -330,7 +330,10 @@ SYSTEM_PROMPT = (
 
 )
 
-MAX_HISTORY_MESSAGES = 20
+# Stored/displayed history; what is sent to the LLM is bounded by CONTEXT_TOKEN_BUDGET instead
+MAX_HISTORY_MESSAGES = 60
+CONTEXT_TOKEN_BUDGET = 3000
+LIVE_REFRESH_SECONDS = 2
 
 @st.cache_data
 def build_beginner_portfolio(capital: float, risk_level: str = "low"):
@@ -374,55 +377,128 @@ def build_beginner_portfolio(capital: float, risk_level: str = "low"):
 
     return portfolio
 
-class ComprehensiveTokenomics:
-    def __init__(self):
-        self.coingecko_base = "https://api.coingecko.com/api/v3"
-
-    def fetch_comprehensive_token_data(self, coin_id: str, investment_amount: float = 1000) -> Dict:
-        """Fetch comprehensive tokenomics data with detailed analysis"""
+def coingecko_get_json(url: str, params: Optional[Dict] = None, timeout: float = 10):
+    """CoinGecko GET through the shared response cache (plain request if the cache module is missing)"""
+    if coingecko_cache is not None:
+        return coingecko_cache.get_json(url, params=params, timeout=timeout)
+    response = get_rate_limiter().request(requests, "GET", url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+class StageGraph:
+    """Tiny dependency-graph executor: every stage starts as soon as the stages it depends on finish"""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add(self, name: str, func, deps: Tuple[str, ...] = ()):
+        """Register a stage; func is called with the results of `deps`, in order"""
+        self.stages[name] = (func, tuple(deps))
+        return self
+
+    def run(self, timeout: Optional[float] = None) -> Tuple[Dict, Dict, Dict]:
+        """Run the graph and return (results, timings in seconds, errors) - partial if stages fail or time out"""
+        results, timings, errors = {}, {}, {}
+        waiting = dict(self.stages)
+        running = {}
+        deadline = time.time() + timeout if timeout else None
+        timings_lock = threading.Lock()
+        returned = threading.Event()
+
+        def timed(name, func, args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                # A timed-out stage keeps running in its worker; it must not write once run() has returned
+                with timings_lock:
+                    if not returned.is_set():
+                        timings[name] = time.perf_counter() - start
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
         try:
-            # Main coin data from CoinGecko
-            coin_data = self._fetch_coingecko_data(coin_id)
-            if not coin_data:
-                return None
-
-            # Historical price analysis
-            price_analysis = self._analyze_price_history(coin_id)
-
-            # Market metrics
-            market_metrics = self._calculate_market_metrics(coin_data, investment_amount)
+            while waiting or running:
+                # Start every stage whose inputs are ready, skip those whose inputs failed
+                for name, (func, deps) in list(waiting.items()):
+                    failed = [d for d in deps if d in errors]
+                    if failed:
+                        errors[name] = f"skipped: {', '.join(failed)} failed"
+                        del waiting[name]
+                    elif all(d in results for d in deps):
+                        running[executor.submit(timed, name, func, [results[d] for d in deps])] = name
+                        del waiting[name]
+
+                if not running:
+                    for name in waiting:
+                        errors[name] = "skipped: unresolved dependencies"
+                    break
 
-            # On-chain and technical metrics
-            technical_metrics = self._calculate_technical_metrics(coin_data)
+                remaining = deadline - time.time() if deadline else None
+                done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    for name in list(running.values()) + list(waiting):
+                        errors[name] = "timed out"
+                    break
 
-            # Liquidity and exchange data
-            liquidity_data = self._fetch_liquidity_data(coin_data)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        errors[name] = str(e)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            with timings_lock:
+                returned.set()
+                timings_snapshot = dict(timings)
 
-            # Social and development metrics
-            social_metrics = self._fetch_social_metrics(coin_data)
+        return results, timings_snapshot, errors
 
-            # Risk assessment
-            risk_assessment = self._calculate_risk_metrics(coin_data, price_analysis, market_metrics)
+class ComprehensiveTokenomics:
+    def __init__(self):
+        self.coingecko_base = "https://api.coingecko.com/api/v3"
+        self.stage_timeout = 25  # Seconds before a slow endpoint is left out of the report
 
-            # Supply economics
-            supply_economics = self._analyze_supply_economics(coin_data)
+    def fetch_comprehensive_token_data(self, coin_id: str, investment_amount: Optional[float] = None) -> Dict:
+        """Fetch comprehensive tokenomics data with detailed analysis (amount-independent unless investment_amount is given)"""
+        try:
+            def require_coin_data():
+                coin_data = self._fetch_coingecko_data(coin_id)
+                if not coin_data:
+                    raise Exception("no coin data")
+                return coin_data
+
+            # Both network calls start together; each analysis runs once its inputs are in
+            graph = StageGraph()
+            graph.add("coin_data", require_coin_data)
+            graph.add("price_analysis", lambda: self._analyze_price_history(coin_id))
+            graph.add("basic_info", self._format_basic_info, ("coin_data",))
+            graph.add("market_metrics", self._calculate_market_metrics, ("coin_data",))
+            graph.add("technical_metrics", self._calculate_technical_metrics, ("coin_data",))
+            graph.add("liquidity_data", self._fetch_liquidity_data, ("coin_data",))
+            graph.add("social_metrics", self._fetch_social_metrics, ("coin_data",))
+            graph.add("risk_assessment", self._calculate_risk_metrics, ("coin_data", "price_analysis", "market_metrics"))
+            graph.add("supply_economics", self._analyze_supply_economics, ("coin_data",))
+            graph.add("competitive_metrics", self._get_competitive_position, ("coin_data",))
+
+            results, timings, errors = graph.run(timeout=self.stage_timeout)
+            if "coin_data" not in results:
+                return None
 
-            # Competitive analysis
-            competitive_metrics = self._get_competitive_position(coin_data)
+            # Combine whatever finished, in the original report order
+            comprehensive_data = {}
+            for stage in ("basic_info", "market_metrics", "price_analysis", "technical_metrics", "liquidity_data",
+                          "social_metrics", "risk_assessment", "supply_economics", "competitive_metrics"):
+                comprehensive_data.update(results.get(stage) or {})
 
-            # Combine all data
-            comprehensive_data = {
-                **self._format_basic_info(coin_data),
-                **market_metrics,
-                **price_analysis,
-                **technical_metrics,
-                **liquidity_data,
-                **social_metrics,
-                **risk_assessment,
-                **supply_economics,
-                **competitive_metrics
-            }
+            comprehensive_data["Stage_Timings"] = {stage: round(seconds, 3) for stage, seconds in timings.items()}
+            if errors:
+                comprehensive_data["Incomplete_Stages"] = errors
+                print(f"Tokenomics stages incomplete for {coin_id}: {errors}")
 
+            if investment_amount is not None:
+                return project_investment_fields(comprehensive_data, investment_amount)
             return comprehensive_data
 
         except Exception as e:
@@ -442,9 +518,7 @@ class ComprehensiveTokenomics:
                 "sparkline": "false"
             }
 
-            response = requests.get(url, params=params, timeout=15)
-            response.raise_for_status()
-            return response.json()
+            return coingecko_get_json(url, params=params, timeout=15)
 
         except Exception as e:
             print(f"CoinGecko API error: {e}")
@@ -462,29 +536,36 @@ class ComprehensiveTokenomics:
 
             analysis = {}
 
-            for period, days in timeframes.items():
-                url = f"{self.coingecko_base}/coins/{coin_id}/market_chart"
-                params = {"vs_currency": "usd", "days": days}
+            # Every window is a subset of the 1y series, so fetch it once and slice by timestamp
+            url = f"{self.coingecko_base}/coins/{coin_id}/market_chart"
+            params = {"vs_currency": "usd", "days": max(timeframes.values())}
 
-                try:
-                    response = requests.get(url, params=params, timeout=10)
-                    response.raise_for_status()
-                    data = response.json()
+            data = coingecko_get_json(url, params=params, timeout=10)
 
-                    prices = [p[1] for p in data.get("prices", [])]
-                    volumes = [v[1] for v in data.get("total_volumes", [])]
+            price_points = np.array(data.get("prices", []), dtype=float).reshape(-1, 2)
+            volume_points = np.array(data.get("total_volumes", []), dtype=float).reshape(-1, 2)
+            if len(price_points) == 0:
+                return analysis
+            last_ts = price_points[-1, 0]
 
-                    if len(prices) >= 2:
-                        returns = self._calculate_returns_metrics(prices, days)
-                        volume_analysis = self._analyze_volume(volumes)
+            # One row per window, NaN before its cutoff, so all windows are measured in one call
+            days = np.array(list(timeframes.values()))
+            cutoffs = last_ts - days * 86400 * 1000
+            windows = np.where(price_points[None, :, 0] >= cutoffs[:, None], price_points[None, :, 1], np.nan)
+            returns = self._calculate_returns_metrics(windows, days)
 
-                        analysis[f"Performance_{period}"] = f"{returns['total_return']:+.2f}% (Vol: {returns['volatility']:.1f}%)"
-                        analysis[f"CAGR_{period}"] = f"{returns['annualized_return']:+.2f}%"
-                        analysis[f"Sharpe_Ratio_{period}"] = f"{returns['sharpe_ratio']:.2f}"
-                        analysis[f"Max_Drawdown_{period}"] = f"-{returns['max_drawdown']:.2f}%"
-                        analysis[f"Avg_Volume_{period}"] = f"${volume_analysis['avg_volume']/1e6:,.1f}M"
+            for i, period in enumerate(timeframes):
+                try:
+                    if np.isnan(returns["total_return"][i]):
+                        continue
+                    volumes = volume_points[volume_points[:, 0] >= cutoffs[i], 1]
+                    volume_analysis = self._analyze_volume(volumes)
 
-                    time.sleep(0.2)  # Rate limiting
+                    analysis[f"Performance_{period}"] = f"{returns['total_return'][i]:+.2f}% (Vol: {returns['volatility'][i]:.1f}%)"
+                    analysis[f"CAGR_{period}"] = f"{returns['annualized_return'][i]:+.2f}%"
+                    analysis[f"Sharpe_Ratio_{period}"] = f"{returns['sharpe_ratio'][i]:.2f}"
+                    analysis[f"Max_Drawdown_{period}"] = f"-{returns['max_drawdown'][i]:.2f}%"
+                    analysis[f"Avg_Volume_{period}"] = f"${volume_analysis['avg_volume']/1e6:,.1f}M"
 
                 except Exception:
                     continue
@@ -494,44 +575,15 @@ class ComprehensiveTokenomics:
         except Exception:
             return {}
 
-    def _calculate_returns_metrics(self, prices: List[float], days: int) -> Dict:
-        """Calculate comprehensive return metrics"""
-        if len(prices) < 2:
-            return {}
-
-        # Calculate returns
-        returns = [np.log(prices[i+1] / prices[i]) for i in range(len(prices)-1)]
-
-        # Total return
-        total_return = (prices[-1] / prices[0] - 1) * 100
-
-        # Annualized return
-        annualized_return = ((prices[-1] / prices[0]) ** (365/days) - 1) * 100
-
-        # Volatility (annualized)
-        volatility = np.std(returns) * np.sqrt(365) * 100
-
-        # Sharpe ratio (assuming 2% risk-free rate)
-        risk_free_rate = 0.02
-        sharpe_ratio = (annualized_return/100 - risk_free_rate) / (volatility/100) if volatility > 0 else 0
-
-        # Maximum drawdown
-        peak = prices[0]
-        max_dd = 0
-        for price in prices:
-            if price > peak:
-                peak = price
-            dd = (peak - price) / peak * 100
-            if dd > max_dd:
-                max_dd = dd
+    def _calculate_returns_metrics(self, prices, days) -> Dict:
+        """Calculate comprehensive return metrics for daily prices (one series, or NaN-padded rows with days per row)"""
+        # Sharpe/Sortino assume a 2% risk-free rate
+        metrics = risk_metrics(prices, periods_per_year=365, years=np.asarray(days) / 365, risk_free_rate=0.02)
 
-        return {
-            "total_return": total_return,
-            "annualized_return": annualized_return,
-            "volatility": volatility,
-            "sharpe_ratio": sharpe_ratio,
-            "max_drawdown": max_dd
-        }
+        # Returns, volatility and drawdowns are shown as percentages
+        for name in ("total_return", "annualized_return", "volatility", "max_drawdown", "var", "cvar"):
+            metrics[name] = metrics[name] * 100
+        return metrics
 
     def _analyze_volume(self, volumes: List[float]) -> Dict:
         """Analyze trading volume patterns"""
@@ -549,7 +601,7 @@ class ComprehensiveTokenomics:
             "trend": trend
         }
 
-    def _calculate_market_metrics(self, coin_data: Dict, investment_amount: float) -> Dict:
+    def _calculate_market_metrics(self, coin_data: Dict) -> Dict:
         """Calculate advanced market metrics"""
         market_data = coin_data.get("market_data", {})
 
@@ -571,9 +623,6 @@ class ComprehensiveTokenomics:
         # Volume metrics
         volume_to_mcap = (volume_24h / market_cap) * 100 if market_cap > 0 else 0
 
-        # Investment calculations
-        tokens_bought = investment_amount / price if price > 0 else 0
-
         # Price performance metrics
         price_changes = {
             "1h": market_data.get("price_change_percentage_1h_in_currency", {}).get("usd"),
@@ -604,7 +653,7 @@ class ComprehensiveTokenomics:
             "Supply_Inflation_Rate": f"{self._calculate_inflation_rate(circulating_supply, total_supply, max_supply):.2f}% annually",
             "Fully_Diluted_Valuation": f"${fdv/1e9:,.2f}B" if fdv >= 1e9 else f"${fdv/1e6:,.2f}M",
             "FDV_to_MCap_Ratio": f"{(fdv/market_cap):,.2f}x" if market_cap > 0 else "N/A",
-            "Investment_Tokens": f"{tokens_bought:,.6f} tokens",
+            "Price_USD": price,
             "Price_Change_1h": f"{price_changes['1h']:+.2f}%" if price_changes['1h'] else "N/A",
             "Price_Change_24h": f"{price_changes['24h']:+.2f}%" if price_changes['24h'] else "N/A",
             "Price_Change_7d": f"{price_changes['7d']:+.2f}%" if price_changes['7d'] else "N/A",
@@ -1094,11 +1143,17 @@ class ComprehensiveTokenomics:
             return description[:200] + "..."
         return description
 
-@st.cache_data
-def get_ai_tokenomics_explanation(token_data: Dict, user_name: str) -> str:
-    """Generate AI explanation of tokenomics data"""
+def openrouter_stream(payload: Dict):
+    """Stream an OpenRouter completion, answered from the persistent completion cache when possible"""
+    if completion_cache is not None:
+        return completion_cache.stream(api_key=AI_API_KEY, **payload)
+    return stream_chat(api_key=AI_API_KEY, **payload)
+
+def stream_ai_tokenomics_explanation(token_data: Dict, user_name: str):
+    """Generate AI explanation of tokenomics data, yielded as it streams in"""
     if not AI_API_KEY or not token_data:
-        return "Unable to generate explanation - API key not configured or no data available."
+        yield "Unable to generate explanation - API key not configured or no data available."
+        return
 
     # Create a summary of key metrics for AI to explain
     key_metrics = {
@@ -1133,42 +1188,54 @@ def get_ai_tokenomics_explanation(token_data: Dict, user_name: str) -> str:
     """
 
     try:
-        url = "https://openrouter.ai/api/v1/chat/completions"
-        headers = {"Authorization": f"Bearer {AI_API_KEY}", "Content-Type": "application/json"}
         payload = {
             "model": "microsoft/phi-3-mini-128k-instruct",
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": 1000
         }
 
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
+        yield from openrouter_stream(payload)
 
     except Exception as e:
-        return f"Unable to generate explanation: {e}"
+        yield f"Unable to generate explanation: {e}"
+
+def project_investment_fields(token_data: Dict, investment_amount: float) -> Dict:
+    """Add the investment-dependent fields to an amount-independent tokenomics record"""
+    price = token_data.get("Price_USD") or 0
+    tokens_bought = investment_amount / price if price > 0 else 0
+
+    return {
+        **token_data,
+        "Investment_Amount": f"${investment_amount:,.2f}",
+        "Investment_Tokens": f"{tokens_bought:,.6f} tokens"
+    }
+
+@st.cache_data(ttl=300)
+def fetch_tokenomics_core(coin_id: str) -> Optional[Dict]:
+    """Amount-independent tokenomics record, cached per coin"""
+    # Concurrent cache misses for the same coin share one analysis
+    return get_single_flight().do(
+        ("tokenomics", coin_id), lambda: ComprehensiveTokenomics().fetch_comprehensive_token_data(coin_id)
+    )
 
 # Enhanced tokenomics function
-@st.cache_data
-def fetch_enhanced_token_data(coin_id: str, investment_amount: float = 1000) -> Tuple[Dict, str]:
+def fetch_enhanced_token_data(coin_id: str, investment_amount: float = 1000) -> Optional[Dict]:
     """
-    Fetch comprehensive tokenomics data and AI explanation
-    Returns: (token_data_dict, ai_explanation)
+    Fetch comprehensive tokenomics data for an investment amount
+    The AI explanation is streamed separately with stream_ai_tokenomics_explanation
     """
     try:
-        analyzer = ComprehensiveTokenomics()
-        token_data = analyzer.fetch_comprehensive_token_data(coin_id, investment_amount)
+        token_data = fetch_tokenomics_core(coin_id)
 
         if not token_data:
-            return None, "Could not fetch token data. Please check the token name/symbol."
-
-        # Get AI explanation
-        ai_explanation = get_ai_tokenomics_explanation(token_data, st.session_state.get("user_name", "User"))
+            return None
 
-        return token_data, ai_explanation
+        # Only the projection depends on the amount, so changing it never refetches
+        return project_investment_fields(token_data, investment_amount)
 
     except Exception as e:
-        return None, f"Error in enhanced tokenomics analysis: {e}"
+        print(f"Error in enhanced tokenomics analysis: {e}")
+        return None
 
 @st.cache_data
 def enhanced_tokenomics_df(token_data: Dict) -> pd.DataFrame:
@@ -1196,7 +1263,7 @@ def enhanced_tokenomics_df(token_data: Dict) -> pd.DataFrame:
             "ATH_Date", "Distance_from_ATH", "All_Time_Low", "ATL_Date", "Distance_from_ATL"
         ],
         "🎯 Investment Analysis": [
-            "Investment_Tokens", "Risk_Level", "Risk_Score", "Risk_Factors", "Investment_Recommendation"
+            "Investment_Amount", "Investment_Tokens", "Risk_Level", "Risk_Score", "Risk_Factors", "Investment_Recommendation"
         ],
         "🌐 Community & Development": [
             "Twitter_Followers", "Reddit_Subscribers", "Telegram_Users", "Social_Media_Score",
@@ -1863,32 +1930,8 @@ def manage_history_length(history_list):
     return temp
 
 def flatten_conversation_for_api(conv):
-    msgs = []
-    for m in conv:
-        role = m.get("role", "user")
-        if role == "system":
-            msgs.append({"role":"system", "content": m.get("content", "")})
-        elif role == "user":
-            msgs.append({"role":"user", "content": m.get("content", "")})
-        elif role == "assistant":
-            kind = m.get("kind", "text")
-            if kind == "tokenomics":
-                # Include both data summary and AI explanation
-                explanation = m.get("ai_explanation", "")
-                data_summary = f"Comprehensive tokenomics analysis completed for {m.get('token_name', 'token')}."
-                content = f"{data_summary}\n\nAI Explanation: {explanation}" if explanation else data_summary
-                msgs.append({"role":"assistant", "content": content})
-            elif kind == "prediction":
-                data = m.get("data", {})
-                text = f"Prediction for {data.get('symbol','')}: Bias {data.get('bias','')}, Strength {data.get('strength','')}\nPlan:\n{data.get('plan','')}"
-                msgs.append({"role":"assistant", "content": text})
-            elif kind == "news":
-                headlines = m.get("data", [])
-                text = "News headlines:\n" + "\n".join(headlines)
-                msgs.append({"role":"assistant", "content": text})
-            else:
-                msgs.append({"role":"assistant", "content": m.get("content", "")})
-    return msgs
+    """API messages for the conversation: recent turns verbatim, older analyses compacted, within the token budget"""
+    return get_context_builder().build(conv, max_tokens=CONTEXT_TOKEN_BUDGET)
 
 # ---------------------------
 # Market news
@@ -1906,7 +1949,7 @@ def fetch_market_news():
         "apiKey": NEWS_API_KEY
     }
     try:
-        r = requests.get(url, params=params, timeout=12)
+        r = get_rate_limiter().request(requests, "GET", url, params=params, timeout=12)
         r.raise_for_status()
         data = r.json()
         return [f"- {a['title']} ({a['source']['name']})" for a in data.get("articles", [])]
@@ -1968,21 +2011,32 @@ def build_beginner_portfolio(capital: float, risk: str = "low"):
 
     return "\n".join(lines)
 
-def ask_nunno(messages):
+def ask_nunno_stream(messages):
+    """Yield the reply as it streams in; errors are yielded as text"""
     if not AI_API_KEY:
-        return "[Error] AI_API_KEY not configured."
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    headers = {"Authorization": f"Bearer {AI_API_KEY}", "Content-Type": "application/json"}
+        yield "[Error] AI_API_KEY not configured."
+        return
     payload = {
         "model": "meta-llama/llama-3.2-11b-vision-instruct",
         "messages": messages
     }
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=30)
-        r.raise_for_status()
-        return r.json()["choices"][0]["message"]["content"]
+        yield from openrouter_stream(payload)
     except Exception as e:
-        return f"[AI Error] {e}"
+        yield f"[AI Error] {e}"
+
+def render_stream(chunks, placeholder=None, throttle: float = 0.05) -> str:
+    """Render text chunks into a placeholder as they arrive and return the full text"""
+    placeholder = placeholder or st.empty()
+    text, shown_at = "", 0.0
+    for chunk in chunks:
+        text += chunk
+        # Redraw at most every `throttle` seconds - markdown re-renders the whole text
+        if time.time() - shown_at >= throttle:
+            placeholder.markdown(text + "▌")
+            shown_at = time.time()
+    placeholder.markdown(text)
+    return text
 
 import re
 
@@ -2004,11 +2058,11 @@ def handle_beginner_finance_questions(user_text):
 
     return None
 
-def analyze_chart(image_b64):
+def analyze_chart_stream(image_b64):
+    """Yield the chart analysis as it streams in; errors are yielded as text"""
     if not AI_API_KEY:
-        return "[Error] AI_API_KEY not configured."
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    headers = {"Authorization": f"Bearer {AI_API_KEY}", "Content-Type": "application/json"}
+        yield "[Error] AI_API_KEY not configured."
+        return
     payload = {
         "model": "meta-llama/llama-3.2-11b-vision-instruct",
         "messages": [{
@@ -2021,11 +2075,9 @@ def analyze_chart(image_b64):
         "max_tokens": 1000
     }
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=60)
-        r.raise_for_status()
-        return r.json()["choices"][0]["message"]["content"]
+        yield from openrouter_stream(payload)
     except Exception as e:
-        return f"[Chart API Error] {e}"
+        yield f"[Chart API Error] {e}"
 
 def is_tokenomics_request(text):
     """Check if request is specifically about tokenomics"""
@@ -2051,6 +2103,11 @@ def is_tokenomics_request(text):
 
     return has_tokenomics
 
+def is_screener_request(text):
+    """Check if request asks to screen/list coins by size or risk rather than analyze one coin"""
+    # Needs a filtered coin list ("low-risk mid caps", "safe coins") - runs before the tokenomics branch
+    return is_screen_query(text)
+
 def is_prediction_request(text):
     """Check if request is specifically about predictions/technical analysis"""
     prediction_keywords = [
@@ -2062,9 +2119,11 @@ def is_prediction_request(text):
 
 def suggest_similar_tokens(user_input):
     try:
-        res = requests.get("https://api.coingecko.com/api/v3/coins/list", timeout=10)
-        res.raise_for_status()
-        coin_list = res.json()
+        # Local trigram index - no network hop once it has been built
+        if get_coin_index is not None:
+            return get_coin_index().suggest(user_input, limit=5)
+
+        coin_list = coingecko_get_json("https://api.coingecko.com/api/v3/coins/list", timeout=10)
         coin_ids = [coin['id'] for coin in coin_list]
         best = process.extract(user_input.lower(), coin_ids, limit=5)
         return [b[0] for b in best if b[1] > 60]
@@ -2097,6 +2156,61 @@ if "chart_analysis" not in st.session_state:
 if "show_terms" not in st.session_state:
     st.session_state.show_terms = False    
 
+@st.cache_resource
+def get_trading_analyzer():
+    """One TradingAnalyzer per server process, shared by every session (and the live kline hub)"""
+    return betterpredictormodule.get_trading_analyzer()
+
+def render_quick_analysis_result(result):
+    """Bias, confidence, confluence counts and price for a Quick Analysis result"""
+    st.markdown(f"**{result['coin_name']}** | {result['tf_name']}")
+
+    bias_color = "green" if "bullish" in str(result['bias']).lower() else "red" if "bearish" in str(result['bias']).lower() else "orange"
+    st.markdown(f"<p style='font-size:18px; font-weight:bold; color:{bias_color};'>{result['bias']}</p>", unsafe_allow_html=True)
+    st.markdown(f"**Confidence:** {result['strength']:.1f}%")
+
+    bullish_count = len(result['confluences'].get('bullish', []))
+    bearish_count = len(result['confluences'].get('bearish', []))
+    neutral_count = len(result['confluences'].get('neutral', []))
+
+    st.markdown(f"""
+<div style='font-size:12px; padding:8px; background:#1a1a2e; border-radius:6px; margin:8px 0;'>
+<span style='color:#00ff88;'>Bullish: {bullish_count}</span> | 
+<span style='color:#ff4444;'>Bearish: {bearish_count}</span> | 
+<span style='color:#ffaa00;'>Neutral: {neutral_count}</span>
+</div>
+""", unsafe_allow_html=True)
+
+    if result['latest'] is not None:
+        latest = result['latest']
+        price = latest.get('Close', 0)
+        rsi = latest.get('RSI_14', 0)
+        st.markdown(f"**Price:** ${price:,.4f}")
+        st.markdown(f"**RSI:** {rsi:.1f}")
+
+def render_live_quick_analysis():
+    """Re-render the Quick Analysis result from its live kline feed (no re-fetch)"""
+    result = st.session_state.get("quick_analysis_result")
+    if not result:
+        return
+    try:
+        snapshot = get_live_hub().feed(result["symbol"], result["tf"]).snapshot()
+    except Exception as e:
+        snapshot = None
+        st.caption(f"Live feed unavailable: {str(e)}")
+    if snapshot:
+        result = {**result, **snapshot}
+        # Keep the last live values around for when the toggle is cleared
+        st.session_state.quick_analysis_result = result
+    render_quick_analysis_result(result)
+    if result.get("updated_at"):
+        status = "📡 Live" if result.get("connected") else "⏳ Connecting"
+        st.caption(f"{status} · updated {datetime.fromtimestamp(result['updated_at']).strftime('%H:%M:%S')}")
+
+# Streamlit >= 1.37 re-runs just this panel on a timer; older versions refresh on each rerun
+if hasattr(st, "fragment"):
+    render_live_quick_analysis = st.fragment(run_every=LIVE_REFRESH_SECONDS)(render_live_quick_analysis)
+
 # Initialize auth state before sidebar
 init_auth_state()
 
@@ -2133,10 +2247,9 @@ with st.sidebar:
             if not check_and_increment_usage("chart_analysis"):
                 st.warning("You've used all 3 free uses. Please sign up to continue!")
             else:
-                with st.spinner("Analyzing chart..."):
-                    result = analyze_chart(st.session_state.uploaded_b64)
-                    st.session_state.chart_analysis = result
-                    st.markdown(get_autoscroll_script(), unsafe_allow_html=True)
+                result = render_stream(analyze_chart_stream(st.session_state.uploaded_b64))
+                st.session_state.chart_analysis = result
+                st.markdown(get_autoscroll_script(), unsafe_allow_html=True)
                 st.rerun()
 
     st.markdown("---")
@@ -2185,6 +2298,12 @@ with st.sidebar:
 
     selected_coin = st.selectbox("Select Coin", list(quick_coins.keys()), key="quick_coin")
     selected_tf = st.selectbox("Select Timeframe", list(quick_timeframes.keys()), key="quick_tf")
+    live_quick = st.checkbox("📡 Live updates", key="quick_live", help="Stream klines over websocket and keep the bias updating") if get_live_hub else False
+
+    # Toggle cleared: stop reading the feed; the hub stops it once no session has read it for a while
+    quick_result = st.session_state.get("quick_analysis_result")
+    if quick_result and quick_result.get("live") and not live_quick:
+        st.session_state.quick_analysis_result = {**quick_result, "live": False}
 
     if st.button("Run Quick Analysis", key="quick_analysis_btn"):
         if not check_and_increment_usage("quick_analysis"):
@@ -2194,11 +2313,13 @@ with st.sidebar:
                 try:
                     symbol = quick_coins[selected_coin]
                     tf = quick_timeframes[selected_tf]
-                    analyzer = betterpredictormodule.TradingAnalyzer()
-                    df = analyzer.fetch_binance_ohlcv(symbol=symbol, interval=tf, limit=500)
-                    df = analyzer.add_comprehensive_indicators(df)
-                    confluences, latest = analyzer.generate_comprehensive_analysis(df)
-                    bias, strength = analyzer.calculate_confluence_strength(confluences)
+                    if live_quick:
+                        snapshot = get_live_hub().feed(symbol, tf).snapshot()
+                        bias, strength = snapshot["bias"], snapshot["strength"]
+                        confluences, latest = snapshot["confluences"], snapshot["latest"]
+                    else:
+                        analyzer = get_trading_analyzer()
+                        df, confluences, latest, bias, strength = analyzer.analyze_symbol(symbol, tf, limit=500)
 
                     st.session_state.quick_analysis_result = {
                         "symbol": symbol,
@@ -2208,7 +2329,8 @@ with st.sidebar:
                         "bias": bias,
                         "strength": strength,
                         "confluences": confluences,
-                        "latest": latest
+                        "latest": latest,
+                        "live": live_quick
                     }
                 except Exception as e:
                     st.error(f"Analysis failed: {str(e)}")
@@ -2219,30 +2341,10 @@ with st.sidebar:
         result = st.session_state.quick_analysis_result
 
         st.markdown("---")
-        st.markdown(f"**{result['coin_name']}** | {result['tf_name']}")
-
-        bias_color = "green" if "bullish" in str(result['bias']).lower() else "red" if "bearish" in str(result['bias']).lower() else "orange"
-        st.markdown(f"<p style='font-size:18px; font-weight:bold; color:{bias_color};'>{result['bias']}</p>", unsafe_allow_html=True)
-        st.markdown(f"**Confidence:** {result['strength']:.1f}%")
-
-        bullish_count = len(result['confluences'].get('bullish', []))
-        bearish_count = len(result['confluences'].get('bearish', []))
-        neutral_count = len(result['confluences'].get('neutral', []))
-
-        st.markdown(f"""
-<div style='font-size:12px; padding:8px; background:#1a1a2e; border-radius:6px; margin:8px 0;'>
-<span style='color:#00ff88;'>Bullish: {bullish_count}</span> | 
-<span style='color:#ff4444;'>Bearish: {bearish_count}</span> | 
-<span style='color:#ffaa00;'>Neutral: {neutral_count}</span>
-</div>
-""", unsafe_allow_html=True)
-
-        if result['latest'] is not None:
-            latest = result['latest']
-            price = latest.get('Close', 0)
-            rsi = latest.get('RSI_14', 0)
-            st.markdown(f"**Price:** ${price:,.4f}")
-            st.markdown(f"**RSI:** {rsi:.1f}")
+        if result.get("live") and get_live_hub:
+            render_live_quick_analysis()
+        else:
+            render_quick_analysis_result(result)
 
         st.markdown("---")
         st.info("For detailed analysis with trading plans and full confluence breakdown, use the chat: 'Predict [coin] [timeframe]'")
@@ -2532,6 +2634,12 @@ with col1:
                 with st.chat_message("assistant"):
                     st.markdown("🧪 **Monte Carlo Simulation**")
                     st.markdown(msg.get("content",""))
+            elif kind == "screener":
+                with st.chat_message("assistant"):
+                    st.markdown("🔎 **Token Screener**")
+                    st.markdown(msg.get("content",""))
+                    if msg.get("data"):
+                        st.dataframe(pd.DataFrame(msg["data"]), use_container_width=True)
             elif kind == "news":
                 with st.chat_message("assistant"):
                     st.markdown("📰 **Market News**")
@@ -2559,6 +2667,9 @@ with col1:
             st.stop()
 
         st.session_state.conversation.append({"role":"user","content":prompt})
+        # Echo the prompt now so streamed replies appear under it before the rerun
+        with st.chat_message("user"):
+            st.markdown(prompt)
         lower = prompt.lower()
 
         assistant_entry = {"role":"assistant", "kind":"text", "content":""}
@@ -2568,82 +2679,16 @@ with col1:
             if betterpredictormodule is None:
                 assistant_entry["content"] = "Prediction features require the local module 'betterpredictormodule'. It's not available on this server."
             else:
-                # Extract symbol
-                symbol = "BTCUSDT"
-                symbol_mappings = {
-                    "btc": "BTCUSDT", "bitcoin": "BTCUSDT", "xbt": "BTCUSDT",
-                    "eth": "ETHUSDT", "ethereum": "ETHUSDT",
-                    "bnb": "BNBUSDT", "binance": "BNBUSDT",
-                    # Layer 1s
-                    "sol": "SOLUSDT", "solana": "SOLUSDT",
-                    "ada": "ADAUSDT", "cardano": "ADAUSDT",
-                    "avax": "AVAXUSDT", "avalanche": "AVAXUSDT",
-                    "dot": "DOTUSDT", "polkadot": "DOTUSDT",
-                    "atom": "ATOMUSDT", "cosmos": "ATOMUSDT",
-                    "near": "NEARUSDT", "near protocol": "NEARUSDT",
-                    "algo": "ALGOUSDT", "algorand": "ALGOUSDT",
-                    "apt": "APTUSDT", "aptos": "APTUSDT",
-                    "sui": "SUIUSDT", "sui network": "SUIUSDT",
-                    # Layer 2s / Scaling
-                    "matic": "MATICUSDT", "polygon": "MATICUSDT",
-                    "op": "OPUSDT", "optimism": "OPUSDT",
-                    "arb": "ARBUSDT", "arbitrum": "ARBUSDT",
-                    "imx": "IMXUSDT", "immutable": "IMXUSDT",
-                    # Meme Coins
-                    "doge": "DOGEUSDT", "dogecoin": "DOGEUSDT",
-                    "shib": "SHIBUSDT", "shiba": "SHIBUSDT", "shiba inu": "SHIBUSDT",
-                    "pepe": "PEPEUSDT", "pepe coin": "PEPEUSDT",
-                    "floki": "FLOKIUSDT", "floki inu": "FLOKIUSDT",
-                    # Stablecoins
-                    "usdt": "USDTUSDT", "tether": "USDTUSDT",
-                    "usdc": "USDCUSDT", "usd coin": "USDCUSDT",
-                    "dai": "DAIUSDT",
-                    "busd": "BUSDUSDT", "binance usd": "BUSDUSDT",
-                    "tusd": "TUSDUSDT", "trueusd": "TUSDUSDT",
-                    # Other Majors & DeFi
-                    "xrp": "XRPUSDT", "ripple": "XRPUSDT",
-                    "ltc": "LTCUSDT", "litecoin": "LTCUSDT",
-                    "link": "LINKUSDT", "chainlink": "LINKUSDT",
-                    "uni": "UNIUSDT", "uniswap": "UNIUSDT",
-                    "aave": "AAVEUSDT",
-                    "comp": "COMPUSDT", "compound": "COMPUSDT",
-                    "sand": "SANDUSDT", "sandbox": "SANDUSDT",
-                    "mana": "MANAUSDT", "decentraland": "MANAUSDT",
-                    "axs": "AXSUSDT", "axie": "AXSUSDT",
-                    "rndr": "RNDRUSDT", "render": "RNDRUSDT",
-                    "gala": "GALAUSDT",
-                    "fil": "FILUSDT", "filecoin": "FILUSDT",
-                    "icp": "ICPUSDT", "internet computer": "ICPUSDT",
-                    "hbar": "HBARUSDT", "hedera": "HBARUSDT",
-                }
-
-                for key, val in symbol_mappings.items():
-                    if key in lower:
-                        symbol = val
-                        break
-
-                # Extract timeframe
-                tf = "15m"
-                tf_mappings = {
-                    "1m": "1m", "1 minute": "1m", "1min": "1m",
-                    "5m": "5m", "5 minute": "5m", "5min": "5m", 
-                    "15m": "15m", "15 minute": "15m", "15min": "15m",
-                    "1h": "1h", "1 hour": "1h", "1hr": "1h", "hourly": "1h",
-                    "4h": "4h", "4 hour": "4h", "4hr": "4h",
-                    "1d": "1d", "daily": "1d", "day": "1d"
-                }
-
-                for key, val in tf_mappings.items():
-                    if key in lower:
-                        tf = val
-                        break
+                # Extract symbol and timeframe in one pass over the prompt
+                entities = get_symbol_registry().extract(prompt)
+                assets = [value for _, kind, value in entities if kind == "asset" and value.binance]
+                intervals = [value for _, kind, value in entities if kind == "interval"]
+                symbol = assets[0].binance if assets else "BTCUSDT"
+                tf = intervals[0] if intervals else "15m"
 
                 try:
-                    analyzer = betterpredictormodule.TradingAnalyzer()
-                    df = analyzer.fetch_binance_ohlcv(symbol=symbol, interval=tf, limit=1000)
-                    df = analyzer.add_comprehensive_indicators(df)
-                    confluences, latest = analyzer.generate_comprehensive_analysis(df)
-                    bias, strength = analyzer.calculate_confluence_strength(confluences)
+                    analyzer = get_trading_analyzer()
+                    df, confluences, latest, bias, strength = analyzer.analyze_symbol(symbol, tf, limit=1000)
 
                     # Capture trading plan output
                     old_stdout = io.StringIO()
@@ -2670,6 +2715,18 @@ with col1:
                 except Exception as e:
                     assistant_entry["content"] = f"Prediction error: {e}"
 
+        # TOKEN SCREENER - one bulk /coins/markets request instead of per-coin analysis
+        elif TokenScreener is not None and is_screener_request(prompt):
+            try:
+                with st.spinner("Screening the market..."):
+                    results = TokenScreener().screen_text(prompt)
+                names = ", ".join(results["Name"].head(10))
+                assistant_entry["kind"] = "screener"
+                assistant_entry["data"] = results[SCREENER_COLUMNS].round(2).to_dict("records")
+                assistant_entry["content"] = f"Found {len(results)} coins matching your screen: {names}" if len(results) else "No coins matched that screen."
+            except Exception as e:
+                assistant_entry["content"] = f"Screener error: {e}"
+
         # ENHANCED TOKENOMICS - now comes AFTER prediction check
         elif is_tokenomics_request(prompt):
             # Extract investment amount
@@ -2680,46 +2737,11 @@ with col1:
 
             # Extract coin/token
             coin = "bitcoin"
-            common_coins = {
-                "btc": "bitcoin", "bitcoin": "bitcoin",
-                "eth": "ethereum", "ethereum": "ethereum",
-                "ada": "cardano", "cardano": "cardano",
-                "sol": "solana", "solana": "solana",
-                "doge": "dogecoin", "dogecoin": "dogecoin",
-                "shib": "shiba-inu", "shiba": "shiba-inu",
-                "matic": "polygon", "polygon": "polygon",
-                "avax": "avalanche-2", "avalanche": "avalanche-2",
-                "dot": "polkadot", "polkadot": "polkadot",
-                "link": "chainlink", "chainlink": "chainlink",
-                "uni": "uniswap", "uniswap": "uniswap",
-                "xrp": "ripple", "ripple": "ripple",
-                "ltc": "litecoin", "litecoin": "litecoin",
-                "bnb": "binancecoin", "binance": "binancecoin",
-                "usdt": "tether", "tether": "tether",
-                "usdc": "usd-coin", "steth": "staked-ether",
-                "ton": "the-open-network", "trx": "tron",
-                "avax": "avalanche-2", "shib": "shiba-inu",
-                "wbtc": "wrapped-bitcoin", "leo": "leo-token",
-                "pepe": "pepe", "near": "near", "dai": "dai",
-                "kas": "kaspa", "icp": "internet-computer",
-                "apt": "aptos", "pol": "polymath",
-                "render": "render-token", "arb": "arbitrum",
-                "vechain": "vechain", "vet": "vechain",
-                "algo": "algorand", "imx": "immutable-x",
-                "op": "optimism", "inj": "injective-protocol",
-                "fil": "filecoin", "hbar": "hedera-hashgraph",
-                "sui": "sui", "atom": "cosmos",
-                "grt": "the-graph", "rune": "thorchain",
-                "sei": "sei-network", "tia": "celestia"
-            }
-
-            for key, val in common_coins.items():
-                if key in lower:
-                    coin = val
-                    break
-
-            # If no common coin found, try fuzzy matching
-            if coin == "bitcoin" and not any(k in lower for k in common_coins.keys()):
+            asset = get_symbol_registry().resolve(prompt)
+            if asset:
+                coin = asset.coingecko
+            else:
+                # If no known coin found, try fuzzy matching
                 tokens = re.findall(r'\b([a-z]{2,10})\b', lower)
                 if tokens:
                     suggestions = suggest_similar_tokens(tokens[0])
@@ -2728,9 +2750,14 @@ with col1:
 
             # Use enhanced tokenomics function
             with st.spinner("Fetching comprehensive tokenomics data..."):
-                token_data, ai_explanation = fetch_enhanced_token_data(coin, investment)
+                token_data = fetch_enhanced_token_data(coin, investment)
 
             if token_data:
+                with st.chat_message("assistant"):
+                    st.markdown("### 🤖 AI Explanation")
+                    ai_explanation = render_stream(
+                        stream_ai_tokenomics_explanation(token_data, st.session_state.get("user_name", "User"))
+                    )
                 assistant_entry["kind"] = "tokenomics"
                 assistant_entry["data"] = token_data
                 assistant_entry["ai_explanation"] = ai_explanation
@@ -2749,7 +2776,8 @@ with col1:
                 news_text = "\n".join(headlines)
                 ai_messages = flatten_conversation_for_api(st.session_state.conversation)
                 ai_messages.append({"role": "user", "content": f"Explain these news headlines in simple terms for a beginner trader:\n{news_text}"})
-                ai_response = ask_nunno(ai_messages)
+                with st.chat_message("assistant"):
+                    ai_response = render_stream(ask_nunno_stream(ai_messages))
                 assistant_entry["content"] = ai_response
 
         # MONTE CARLO
@@ -2766,7 +2794,8 @@ with col1:
         else:
             ai_messages = flatten_conversation_for_api(st.session_state.conversation)
             ai_messages.append({"role": "user", "content": prompt})
-            ai_response = ask_nunno(ai_messages)
+            with st.chat_message("assistant"):
+                ai_response = render_stream(ask_nunno_stream(ai_messages))
             assistant_entry["content"] = ai_response
 
         st.session_state.conversation.append(assistant_entry)
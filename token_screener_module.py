@@ -0,0 +1,219 @@
+"""Token screener - bulk CoinGecko /coins/markets pages scored as vectorized columns"""
+import re
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+from rate_limit_module import get_rate_limiter
+from risk_metrics_module import risk_metrics
+
+try:
+    from http_cache_module import coingecko_cache
+except Exception:
+    coingecko_cache = None
+
+MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets"
+PER_PAGE = 250
+
+# Same thresholds as ComprehensiveTokenomics._calculate_technical_metrics / _calculate_risk_metrics
+MARKET_CAP_CATEGORIES = [
+    (10e9, "Large Cap"),
+    (2e9, "Mid Cap"),
+    (300e6, "Small Cap"),
+    (50e6, "Micro Cap"),
+    (0, "Nano Cap"),
+]
+RISK_LEVELS = [
+    (60, "EXTREMELY HIGH RISK"),
+    (40, "HIGH RISK"),
+    (20, "MODERATE RISK"),
+    (10, "LOW-MODERATE RISK"),
+    (0, "RELATIVELY LOW RISK"),
+]
+
+DISPLAY_COLUMNS = ["Rank", "Name", "Symbol", "Price", "Market_Cap", "Category", "Volume_to_MCap",
+                   "FDV_Ratio", "Change_7d", "Volatility_7d", "Risk_Score", "Risk_Level"]
+
+# Filter words only count when they describe a list of coins ("safe coins", "liquid small caps"),
+# never on their own - "a safe wallet" or "what affects liquidity" are ordinary chat questions
+CAP_PATTERN = r"(?:large|mid|small|micro|nano)[\s-]?caps?"
+COIN_NOUN_PATTERN = r"(?:coins|tokens|cryptos|altcoins|alts|projects)"
+COIN_LIST_PATTERN = rf"(?:{CAP_PATTERN}(?:\s+{COIN_NOUN_PATTERN})?|{COIN_NOUN_PATTERN})"
+FILTER_WORD_PATTERN = (r"(?:(?:low|lower|moderate|medium|high|higher)[\s-]risk|safe(?:r|st)?|risky|liquid"
+                       r"|high[\s-]volume|low[\s-](?:fdv|dilution))")
+FILTERED_LIST_PATTERN = (rf"(?:{FILTER_WORD_PATTERN}(?:,?\s+(?:and\s+)?{FILTER_WORD_PATTERN})*\s+{COIN_LIST_PATTERN}"
+                         rf"|{CAP_PATTERN}(?:\s+{COIN_NOUN_PATTERN})?)")
+# A screen asks for that list outright: "show me low-risk mid caps", "which tokens are liquid small caps"
+SCREEN_REQUEST = re.compile(
+    r"\b(?:screen(?:er)?:?(?:\s+for)?|show(?:\s+me)?|list|find(?:\s+me)?|give\s+me|which\s+(?:coins|tokens)\s+are)"
+    r"(?:\s+(?:the|all|some|any|top\s+\d{1,3}|\d{1,3}))*"
+    rf"\s+{FILTERED_LIST_PATTERN}\b"
+)
+
+
+def _default_get_json(url: str, params: Optional[Dict] = None, timeout: float = 15):
+    if coingecko_cache is not None:
+        return coingecko_cache.get_json(url, params=params, timeout=timeout)
+    response = get_rate_limiter().request(requests, "GET", url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_markets(pages: int = 1, vs_currency: str = "usd", get_json: Optional[Callable] = None) -> List[Dict]:
+    """Top `pages * 250` coins by market cap, with 7d hourly sparklines"""
+    get_json = get_json or _default_get_json
+    coins = []
+    for page in range(1, pages + 1):
+        batch = get_json(MARKETS_URL, params={
+            "vs_currency": vs_currency,
+            "order": "market_cap_desc",
+            "per_page": PER_PAGE,
+            "page": page,
+            "sparkline": "true",
+            "price_change_percentage": "24h,7d,30d"
+        }, timeout=15)
+        coins.extend(batch or [])
+        if not batch or len(batch) < PER_PAGE:
+            break
+    return coins
+
+
+def build_screener_frame(coins: List[Dict]) -> pd.DataFrame:
+    """One row per coin with market-cap category, liquidity, FDV ratio and risk score columns"""
+    def column(field):
+        return np.array([coin.get(field) for coin in coins], dtype=float)
+
+    market_cap = np.nan_to_num(column("market_cap"))
+    price = np.nan_to_num(column("current_price"))
+    volume = np.nan_to_num(column("total_volume"))
+    circulating = np.nan_to_num(column("circulating_supply"))
+    total_supply = np.nan_to_num(column("total_supply"))
+    max_supply = np.nan_to_num(column("max_supply"))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_to_mcap = np.where(market_cap > 0, volume / market_cap * 100, 0.0)
+        fdv = np.where(total_supply > 0, total_supply * price, market_cap)
+        fdv_ratio = np.where(market_cap > 0, fdv / market_cap, np.nan)
+        circulating_pct = np.where((total_supply > 0) & (circulating > 0), circulating / total_supply * 100, np.nan)
+
+    # Annualized volatility of the 7d hourly sparkline, all coins in one batch
+    sparklines = [(coin.get("sparkline_in_7d") or {}).get("price") or [] for coin in coins]
+    width = max((len(prices) for prices in sparklines), default=0)
+    padded = np.full((len(coins), max(width, 1)), np.nan)
+    for i, prices in enumerate(sparklines):
+        if prices:
+            padded[i, width - len(prices):] = np.array(prices, dtype=float)
+    volatility = risk_metrics(padded, periods_per_year=24 * 365)["volatility"] * 100
+
+    category = np.select([market_cap >= threshold for threshold, _ in MARKET_CAP_CATEGORIES[:-1]],
+                         [name for _, name in MARKET_CAP_CATEGORIES[:-1]], MARKET_CAP_CATEGORIES[-1][1])
+
+    risk_score = (
+        np.select([market_cap < 50e6, market_cap < 300e6, market_cap < 2e9], [25, 15, 5], 0)
+        + np.select([circulating_pct < 50, circulating_pct < 80], [20, 10], 0)
+        + np.select([volume_to_mcap < 0.5, volume_to_mcap < 2], [20, 10], 0)
+        + np.select([volatility > 100, volatility > 50], [25, 15], 0)
+    )
+    risk_level = np.select([risk_score >= threshold for threshold, _ in RISK_LEVELS[:-1]],
+                           [name for _, name in RISK_LEVELS[:-1]], RISK_LEVELS[-1][1])
+
+    return pd.DataFrame({
+        "Id": [coin.get("id") for coin in coins],
+        "Rank": column("market_cap_rank"),
+        "Name": [coin.get("name") for coin in coins],
+        "Symbol": [str(coin.get("symbol") or "").upper() for coin in coins],
+        "Price": price,
+        "Market_Cap": market_cap,
+        "Volume_24h": volume,
+        "Category": category,
+        "Volume_to_MCap": volume_to_mcap,
+        "FDV": fdv,
+        "FDV_Ratio": fdv_ratio,
+        "Circulating_Pct": circulating_pct,
+        "Change_24h": column("price_change_percentage_24h_in_currency"),
+        "Change_7d": column("price_change_percentage_7d_in_currency"),
+        "Change_30d": column("price_change_percentage_30d_in_currency"),
+        "Volatility_7d": volatility,
+        "Risk_Score": risk_score,
+        "Risk_Level": risk_level
+    })
+
+
+def parse_screen_query(text: str) -> Dict:
+    """Filters for a free-text screen such as "show me low-risk mid caps with good liquidity" """
+    text = text.lower()
+    filters = {}
+
+    categories = [name for _, name in MARKET_CAP_CATEGORIES
+                  if re.search(rf"\b{name.split()[0].lower()}[\s-]?caps?\b", text)]
+    if categories:
+        filters["categories"] = categories
+
+    if re.search(rf"\b(low|lower)[\s-]risk\b|\bsafe(r|st)?\s+{COIN_LIST_PATTERN}", text):
+        filters["max_risk"] = 19
+    elif re.search(r"\b(moderate|medium)[\s-]risk\b", text):
+        filters["min_risk"], filters["max_risk"] = 20, 39
+    elif re.search(rf"\b(high|higher)[\s-]risk\b|\brisky\s+{COIN_LIST_PATTERN}", text):
+        filters["min_risk"] = 40
+
+    if re.search(rf"\bliquid\s+{COIN_LIST_PATTERN}|\bhigh[\s-]volume\b"
+                 r"|\bwith\s+(good|high|deep|strong|decent)\s+(liquidity|volume)\b", text):
+        filters["min_volume_to_mcap"] = 2
+
+    if re.search(r"\b(fully diluted|low fdv|low dilution)\b", text):
+        filters["max_fdv_ratio"] = 1.2
+
+    limit = re.search(r"\btop\s+(\d{1,3})\b", text)
+    if limit:
+        filters["limit"] = int(limit.group(1))
+    return filters
+
+
+def is_screen_query(text: str) -> bool:
+    """True when text asks for a filtered list of coins rather than chatting about one topic"""
+    if not SCREEN_REQUEST.search(text.lower()):
+        return False
+    # ...and the filters it names actually parse (a row limit alone is not a screen)
+    filters = parse_screen_query(text)
+    filters.pop("limit", None)
+    return bool(filters)
+
+
+class TokenScreener:
+    """Screens the top coins by market cap from one or two /coins/markets requests"""
+
+    def __init__(self, pages: int = 2, get_json: Optional[Callable] = None):
+        self.pages = pages
+        self.get_json = get_json
+
+    def frame(self) -> pd.DataFrame:
+        """Scored table of the current market (the HTTP cache keeps repeat screens cheap)"""
+        return build_screener_frame(fetch_markets(self.pages, get_json=self.get_json))
+
+    def screen(self, categories: Optional[List[str]] = None, min_risk: Optional[int] = None,
+               max_risk: Optional[int] = None, min_volume_to_mcap: Optional[float] = None,
+               max_fdv_ratio: Optional[float] = None, limit: int = 20,
+               df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Coins matching every given filter, lowest risk then largest market cap first"""
+        df = self.frame() if df is None else df
+        mask = np.ones(len(df), dtype=bool)
+        if categories:
+            mask &= df["Category"].isin(categories).to_numpy()
+        if min_risk is not None:
+            mask &= (df["Risk_Score"] >= min_risk).to_numpy()
+        if max_risk is not None:
+            mask &= (df["Risk_Score"] <= max_risk).to_numpy()
+        if min_volume_to_mcap is not None:
+            mask &= (df["Volume_to_MCap"] >= min_volume_to_mcap).to_numpy()
+        if max_fdv_ratio is not None:
+            mask &= (df["FDV_Ratio"] <= max_fdv_ratio).to_numpy()
+
+        result = df[mask].sort_values(["Risk_Score", "Market_Cap"], ascending=[True, False])
+        return result.head(limit)
+
+    def screen_text(self, text: str, limit: int = 20) -> pd.DataFrame:
+        filters = parse_screen_query(text)
+        filters.setdefault("limit", limit)
+        return self.screen(**filters)
@@ -0,0 +1,152 @@
+"""Persistent user store backed by SQLite - indexed by email, usage counters incremented in place"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+DEFAULT_USER_DB = "user_data.db"
+LEGACY_USER_FILE = "user_data.json"
+FEATURES = ("chat", "quick_analysis", "tokenomics", "prediction", "chart_analysis", "news")
+
+
+class UserStore:
+    """Registered users and their per-feature usage counts.
+
+    Every lookup is a primary-key hit on the email, and usage is recorded with in-place
+    `count = count + 1` updates inside one transaction, so concurrent Streamlit sessions
+    never read-modify-write a shared file. A legacy user_data.json is imported once when
+    the database is first created.
+    """
+
+    def __init__(self, path: str = DEFAULT_USER_DB, legacy_path: Optional[str] = LEGACY_USER_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    email TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    total_uses INTEGER NOT NULL DEFAULT 0,
+                    last_active TEXT NOT NULL
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS feature_usage (
+                    email TEXT NOT NULL,
+                    feature TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (email, feature)
+                ) WITHOUT ROWID
+            """)
+
+        if legacy_path:
+            self.migrate_json(legacy_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the store safe across Streamlit threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_user(self, email: str) -> Optional[Dict]:
+        """User record in the shape the UI expects, or None"""
+        email = email.lower()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT name, email, created_at, total_uses, last_active FROM users WHERE email = ?", (email,)
+            ).fetchone()
+            if row is None:
+                return None
+            features = conn.execute("SELECT feature, count FROM feature_usage WHERE email = ?", (email,)).fetchall()
+
+        name, email, created_at, total_uses, last_active = row
+        return {
+            "name": name,
+            "email": email,
+            "created_at": created_at,
+            "total_uses": total_uses,
+            "features_used": {**{feature: 0 for feature in FEATURES}, **dict(features)},
+            "last_active": last_active
+        }
+
+    def create_user(self, name: str, email: str) -> Dict:
+        """Register a user with zeroed counters (an existing email keeps its counters)"""
+        email = email.lower()
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO users (email, name, created_at, total_uses, last_active) VALUES (?, ?, ?, 0, ?) "
+                "ON CONFLICT(email) DO UPDATE SET name = excluded.name, last_active = excluded.last_active",
+                (email, name, now, now)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO feature_usage (email, feature, count) VALUES (?, ?, 0)",
+                [(email, feature) for feature in FEATURES]
+            )
+        return self.get_user(email)
+
+    def record_usage(self, email: str, feature: str) -> bool:
+        """Atomically bump total_uses and the feature counter; False for unknown users"""
+        email = email.lower()
+        with self._lock, self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE users SET total_uses = total_uses + 1, last_active = ? WHERE email = ?",
+                (datetime.now().isoformat(), email)
+            ).rowcount
+            if not updated:
+                return False
+            conn.execute(
+                "INSERT INTO feature_usage (email, feature, count) VALUES (?, ?, 1) "
+                "ON CONFLICT(email, feature) DO UPDATE SET count = count + 1",
+                (email, feature)
+            )
+        return True
+
+    def migrate_json(self, legacy_path: str) -> int:
+        """Import users from a legacy JSON file into an empty store, then rename the file"""
+        if not os.path.exists(legacy_path):
+            return 0
+        try:
+            with open(legacy_path, "r") as f:
+                users = json.load(f).get("users", {})
+        except Exception as e:
+            print(f"User data migration skipped: {e}")
+            return 0
+
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            if conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]:
+                return 0
+            for key, user in users.items():
+                email = (user.get("email") or key).lower()
+                conn.execute(
+                    "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)",
+                    (email, user.get("name", ""), user.get("created_at", now),
+                     int(user.get("total_uses", 0)), user.get("last_active", now))
+                )
+                features = {**{feature: 0 for feature in FEATURES}, **user.get("features_used", {})}
+                conn.executemany(
+                    "INSERT OR REPLACE INTO feature_usage VALUES (?, ?, ?)",
+                    [(email, feature, int(count)) for feature, count in features.items()]
+                )
+
+        # Keep the original for reference, but make sure it is never imported twice
+        os.replace(legacy_path, f"{legacy_path}.migrated")
+        print(f"✅ Migrated {len(users)} users from {legacy_path}")
+        return len(users)
+
+
+_user_store = None
+_user_store_lock = threading.Lock()
+
+
+def get_user_store() -> UserStore:
+    """Process-wide user store, opened (and migrated) once"""
+    global _user_store
+    with _user_store_lock:
+        if _user_store is None:
+            _user_store = UserStore()
+        return _user_store